@@ -0,0 +1,121 @@
+"""
+bench.py
+----------
+Search benchmarks for the Royal Gambit AI.
+Run from the ai_chess_bot folder, e.g.:
+    python src/bench.py ordering --depth 4
+    python src/bench.py parallel --depth 4 --workers 4
+    python src/bench.py pruning --depth 5
+"""
+
+import argparse, math, multiprocessing, time
+
+from engine import AI, Board, Move, Square
+
+# positions reached from the start position by the given moves
+POSITIONS = {
+    'start': [],
+    'italian': ['e2e4', 'e7e5', 'g1f3', 'b8c6', 'f1c4', 'f8c5'],
+    'queens gambit': ['d2d4', 'd7d5', 'c2c4', 'e7e6', 'b1c3', 'g8f6'],
+    'sicilian': ['e2e4', 'c7c5', 'g1f3', 'd7d6', 'd2d4', 'c5d4', 'f3d4', 'g8f6', 'b1c3'],
+}
+
+def parse_square(name):
+    # 'e2' -> Square(6, 4)
+    return Square(8 - int(name[1]), ord(name[0]) - ord('a'))
+
+def play(board, moves):
+    for text in moves:
+        initial, final = parse_square(text[:2]), parse_square(text[2:4])
+        piece = board.squares[initial.row][initial.col].piece
+        board.calc_moves(piece, initial.row, initial.col)
+        move = Move(initial, final)
+        if not board.valid_move(piece, move):
+            raise ValueError(f'illegal move {text}')
+        board.move(piece, move)
+    return board
+
+def position(name):
+    return play(Board(), POSITIONS[name])
+
+def search(ai, board, depth):
+    '''
+        Fixed depth search from an empty table: (boards explored, seconds, eval, move)
+    '''
+    ai.tt.clear()
+    ai.explored = 0
+    start = time.time()
+    eval, move = ai.minimax(board, depth, board.next_player == 'white', -math.inf, math.inf)
+    return ai.explored, time.time() - start, eval, move
+
+def compare_ordering(depth):
+    '''
+        Boards explored at a fixed depth without and with move ordering
+    '''
+    print(f'{"position":<16}{"unordered":>12}{"ordered":>12}{"ratio":>8}{"time":>16}')
+    for name in POSITIONS:
+        unordered = search(AI(ordering=False), position(name), depth)
+        ordered = search(AI(ordering=True), position(name), depth)
+        print(f'{name:<16}{unordered[0]:>12}{ordered[0]:>12}{ordered[0] / unordered[0]:>8.2f}'
+              f'{unordered[1]:>7.2f}s ->{ordered[1]:>5.2f}s')
+
+def compare_pruning(depth):
+    '''
+        Boards explored and time to a fixed depth without and with null move
+        pruning and late move reductions
+    '''
+    configs = [('none', False, False), ('null move', True, False), ('lmr', False, True), ('both', True, True)]
+    print(f'{"position":<16}' + ''.join(f'{name:>18}' for name, null_move, reductions in configs))
+    totals = [[0, 0] for config in configs]
+    for name in POSITIONS:
+        line = f'{name:<16}'
+        for i, (config, null_move, reductions) in enumerate(configs):
+            explored, seconds, eval, move = search(AI(null_move=null_move, reductions=reductions), position(name), depth)
+            totals[i][0] += explored
+            totals[i][1] += seconds
+            line += f'{explored:>10}{seconds:>7.2f}s'
+        print(line)
+    print(f'{"total":<16}' + ''.join(f'{explored:>10}{seconds:>7.2f}s' for explored, seconds in totals))
+
+def compare_parallel(depth, workers):
+    '''
+        Time to search a fixed depth in one process and split across worker processes
+    '''
+    ai = AI(workers=workers)
+    # start the worker processes before timing
+    ai.search_root(position('start'), 1, True)
+
+    print(f'{workers} workers, {multiprocessing.cpu_count()} cpus')
+    print(f'{"position":<16}{"1 process":>12}{"parallel":>12}{"speedup":>9}{"boards":>18}')
+    total_single = total_parallel = 0
+    for name in POSITIONS:
+        single = search(AI(), position(name), depth)
+
+        board = position(name)
+        ai.tt.clear()
+        ai.explored = 0
+        start = time.time()
+        ai.search_root(board, depth, board.next_player == 'white')
+        parallel = (ai.explored, time.time() - start)
+
+        total_single += single[1]
+        total_parallel += parallel[1]
+        print(f'{name:<16}{single[1]:>11.2f}s{parallel[1]:>11.2f}s{single[1] / parallel[1]:>8.2f}x'
+              f'{single[0]:>9}{parallel[0]:>9}')
+
+    print(f'{"total":<16}{total_single:>11.2f}s{total_parallel:>11.2f}s{total_single / total_parallel:>8.2f}x')
+    ai.parallel.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Royal Gambit search benchmarks')
+    parser.add_argument('benchmark', choices=['ordering', 'parallel', 'pruning'])
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    if args.benchmark == 'ordering':
+        compare_ordering(args.depth)
+    elif args.benchmark == 'pruning':
+        compare_pruning(args.depth)
+    elif args.benchmark == 'parallel':
+        compare_parallel(args.depth, args.workers)
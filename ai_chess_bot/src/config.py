@@ -5,8 +5,7 @@ Royal Gambit configuration settings.
 """
 
 import pygame
-import os
-from sound import Sound
+from sound import Audio
 from theme import Theme
 
 class Config:
@@ -18,14 +17,17 @@ class Config:
         self.theme = self.themes[self.idx]
         # Set up a custom font (monospace) for board labels
         self.font = pygame.font.SysFont('monospace', 18, bold=True)
-        # Load sounds for various game actions
-        self.move_sound = Sound(os.path.join('assets/sounds/move.wav'))
-        self.capture_sound = Sound(os.path.join('assets/sounds/capture.wav'))
-        self.castle_sound = Sound(os.path.join('assets/sounds/castle.wav'))
-        self.promote_sound = Sound(os.path.join('assets/sounds/promote.wav'))
-        self.start_sound = Sound(os.path.join('assets/sounds/start.wav'))
-        self.check_sound = Sound(os.path.join('assets/sounds/check.wav'))
-        self.checkmate_sound = Sound(os.path.join('assets/sounds/checkmate.wav'))
+        # Fonts of the move log and the endgame text (font lookups are slow, so only once)
+        self.log_font = pygame.font.SysFont('Arial', 14)
+        self.endgame_font = pygame.font.SysFont('Helvetica', 32, True, False)
+        # Sounds for various game actions (loaded once per process)
+        self.move_sound = Audio.get('move')
+        self.capture_sound = Audio.get('capture')
+        self.castle_sound = Audio.get('castle')
+        self.promote_sound = Audio.get('promote')
+        self.start_sound = Audio.get('start')
+        self.check_sound = Audio.get('check')
+        self.checkmate_sound = Audio.get('checkmate')
 
     def change_theme(self):
         # Cycle through available themes
@@ -7,8 +7,9 @@ Constants for Royal Gambit.
 # Screen dimensions
 WIDTH = 800
 HEIGHT = 800
+# Move log panel, right of the board
+LOG_WIDTH = 210
 
 # Board dimensions
-ROWS = 8
-COLS = 8
+from engine.const import ROWS, COLS
 SQSIZE = WIDTH // COLS
@@ -4,8 +4,8 @@ dragger.py
 Handles the drag-and-drop behavior for moving pieces in Royal Gambit.
 """
 
-import pygame
 from const import SQSIZE
+from sprites import Sprites
 
 class Dragger:
     def __init__(self):
@@ -18,12 +18,11 @@ class Dragger:
 
     def update_blit(self, surface):
         # Update and draw the dragged piece with a larger texture for visual clarity.
-        self.piece.set_texture(size=128)
-        texture = self.piece.texture
-        img = pygame.image.load(texture)
-        img_center = (self.mouseX, self.mouseY)
-        self.piece.texture_rect = img.get_rect(center=img_center)
-        surface.blit(img, self.piece.texture_rect)
+        surface.blit(Sprites.get(self.piece, size=128), self.rect())
+
+    def rect(self):
+        # Screen area covered by the dragged piece.
+        return Sprites.get(self.piece, size=128).get_rect(center=(self.mouseX, self.mouseY))
 
     def update_mouse(self, pos):
         self.mouseX, self.mouseY = pos
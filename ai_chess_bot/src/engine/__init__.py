@@ -0,0 +1,14 @@
+"""
+engine
+----------
+Headless chess engine for Royal Gambit: board, pieces, moves, opening book and AI.
+Imports nothing from pygame, so it runs without a display or audio device.
+"""
+
+from .square import Square
+from .move import Move
+from .piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from .board import Board, START_FEN
+from .book import Book
+from .ai import AI, SearchTimeout
+from .worker import AIWorker
@@ -0,0 +1,610 @@
+"""
+ai.py
+----------
+Chess engine AI for Royal Gambit. Implements minimax algorithm with alpha-beta pruning.
+"""
+
+import math, os, random, time
+
+from .const import *
+from .piece import *
+from .book import Book
+from .binary_book import BinaryBook, BOOK_PATH
+from .tablebase import Tablebase, TB_PATH, TB_PIECES
+from .move import Move, FLAGS, PROMOTION, EN_PASSANT
+from .bitboard import bits, popcount
+from .tt import TranspositionTable, EXACT, LOWER, UPPER
+
+# piece values used to order captures (most valuable victim - least valuable attacker)
+ORDER_VALUES = {'pawn': 1, 'knight': 3, 'bishop': 3, 'rook': 5, 'queen': 9, 'king': 20}
+MAX_PLY = 64
+# quiescence search: maximum plies of captures after the main search and the
+# margin (in pawns) a capture needs to have a chance of raising alpha
+QUIESCENCE_PLY = 8
+DELTA = 2.0
+# null move pruning: depth reduction of the null move search
+NULL_MOVE_R = 2
+# late move reductions: moves searched at full depth before reducing the others
+LMR_MOVES = 3
+# width of the null windows used to test a bound
+WINDOW = 0.001
+
+class SearchTimeout(Exception):
+    # raised inside minimax when the time budget of the move runs out (or the search is stopped)
+    pass
+
+class AI:
+
+    def __init__(self, engine='book', depth=3, tt_size=16, time_limit=3.0, ordering=True, workers=1, quiescence=True,
+                 null_move=True, reductions=True, book_path=BOOK_PATH, tb_path=TB_PATH):
+        self.engine = engine
+        self.start_engine = engine # engine of a new game
+        self.depth = depth # maximum depth of the iterative deepening
+        self.time_limit = time_limit # seconds per move
+        # opening book: the binary book (memory-mapped) when there is one, else the tree
+        if book_path is not None and os.path.exists(book_path):
+            self.book = BinaryBook(book_path)
+        else:
+            self.book = Book()
+        # endgame tablebases (mapped when a table is first probed)
+        self.tablebase = Tablebase(tb_path)
+        self.tt_size = tt_size
+        self.tt = TranspositionTable(tt_size) # size in MB
+        self.color = 'black'
+        self.game_moves = []
+        self.explored = 0
+        self.deadline = None
+        self.node_limit = None # boards explored per move (None = no limit)
+        self.max_nodes = None
+        self.stopped = False # set from another thread to cancel the search
+        self.pv = {} # position hash -> move of the last principal variation
+        # move ordering
+        self.ordering = ordering
+        self.killers = [[0, 0] for ply in range(MAX_PLY)] # two quiet cutoff moves per ply
+        self.history = [[0] * 64 for sq in range(64)] # cutoff scores by initial/final square
+        self.quiescence_search = quiescence # resolve captures at the leaves
+        # pruning
+        self.null_move = null_move
+        self.reductions = reductions # late move reductions
+        # parallel search: number of processes (1 = search in this process)
+        self.workers = workers
+        self.parallel = None
+        
+    def new_game(self):
+        '''
+            Forget the game played (moves, search tables); the book, difficulty and
+            settings are kept
+        '''
+        self.engine = self.start_engine
+        self.game_moves = []
+        self.tt.clear()
+        self.pv = {}
+        self.killers = [[0, 0] for ply in range(MAX_PLY)]
+        self.history = [[0] * 64 for sq in range(64)]
+
+    def set_difficulty(self, level):
+        self.difficulty = level
+        if level == 'easy':
+            self.depth = 2
+            self.time_limit = 1.0
+        elif level == 'medium':
+            self.depth = 4
+            self.time_limit = 2.0
+        elif level == 'hard':
+            self.depth = 6
+            self.time_limit = 5.0
+        elif level == 'expert':
+            self.depth = 8
+            self.time_limit = 10.0
+        else:
+            self.depth = 4
+            self.time_limit = 2.0
+
+    def book_move(self, board):
+        # the binary book is keyed by position, the tree by the moves of the game
+        if isinstance(self.book, BinaryBook):
+            move = self.book.next_move(board.hash, weighted=True)
+            return Move.decode(move) if move is not None else None
+        move = self.book.next_move(self.game_moves, weighted=True)
+        return move
+
+    # -------
+    # MINIMAX
+    # -------
+
+    def threats(self, board, color):
+        # enemy pieces attacked by the color, read from the board's attack map
+        eval = 0
+        enemy = 'black' if color == 'white' else 'white'
+        for sq in bits(board.attack_map(color) & board.occupied[enemy]):
+            attacked = board.squares[sq // COLS][sq % COLS]
+            # checks
+            if attacked.piece.name == 'king':
+                eval += abs(attacked.piece.value) / 10500
+            
+            # threat
+            else:
+                eval += abs(attacked.piece.value) / 45
+
+        return eval
+
+    def mobility(self, board, color):
+        # squares attacked by the color that aren't occupied by its own pieces
+        return 0.01 * popcount(board.attack_map(color) & ~board.occupied[color])
+
+    def static_eval(self, board):
+        # white - black material and heatmaps, kept up to date by the board
+        eval = board.material + board.positional
+
+        # moves
+        eval += self.mobility(board, 'white') - self.mobility(board, 'black')
+
+        # checks
+        eval += self.threats(board, 'white') - self.threats(board, 'black')
+        
+        eval = round(eval, 5)
+        return eval
+
+    def get_moves(self, board, color, pieces=None):
+        # moves (packed ints) of the color's pieces (or only of the pieces in the given bitboard)
+        return board.generate(color, pieces)
+
+    def order_moves(self, board, moves, ply, first=None):
+        '''
+            Sort the moves: principal variation / table move, promotions, captures by
+            most valuable victim - least valuable attacker, killer moves, then history
+        '''
+        killers = self.killers[ply] if ply < MAX_PLY else [0, 0]
+        history = self.history
+        squares = board.squares
+
+        def score(move):
+            if move == first:
+                return 1 << 30
+            initial, final = move & 63, move >> 6 & 63
+            victim = squares[final >> 3][final & 7].piece
+            victim = ORDER_VALUES[victim.name] if victim is not None else 0
+            # promotions
+            flag = move & FLAGS
+            if flag == PROMOTION:
+                return (1 << 29) + victim
+            # captures
+            if victim:
+                return (1 << 28) + 10 * victim - ORDER_VALUES[squares[initial >> 3][initial & 7].piece.name]
+            if flag == EN_PASSANT:
+                return (1 << 28) + 9
+            # killers
+            if move == killers[0]:
+                return 1 << 27
+            if move == killers[1]:
+                return (1 << 27) - 1
+            # history
+            return history[initial][final]
+
+        if not self.ordering:
+            # only the principal variation / table move goes first
+            if first is not None:
+                for i, move in enumerate(moves):
+                    if move == first:
+                        moves.insert(0, moves.pop(i))
+                        break
+            return moves
+
+        moves.sort(key=score, reverse=True)
+        return moves
+
+    def cutoff(self, board, move, depth, ply):
+        '''
+            Remember a quiet move that caused a beta cutoff (killers and history)
+        '''
+        if ply >= MAX_PLY or not self.quiet(board, move):
+            return
+
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        history = self.history[move & 63]
+        history[move >> 6 & 63] += depth * depth
+        # keep the history scores below the killers
+        if history[move >> 6 & 63] >= 1 << 26:
+            self.age_history()
+
+    def age_history(self):
+        for row in self.history:
+            for i in range(64):
+                row[i] //= 2
+
+    def out_of_time(self):
+        # stopped, past the deadline or over the node limit of the move
+        return (self.stopped or (self.deadline is not None and time.time() > self.deadline)
+                or (self.max_nodes is not None and self.explored >= self.max_nodes))
+
+    def minimax(self, board, depth, maximizing, alpha, beta, ply=0):
+        # out of time or stopped ? (checked every 1024 boards)
+        if self.explored % 1024 == 0 and self.out_of_time():
+            raise SearchTimeout()
+
+        # endgame tablebases: the exact result, with the distance to mate
+        if (ply > 0 and self.tablebase.files and not board.castling_state
+                and popcount(board.occupied['white'] | board.occupied['black']) <= TB_PIECES):
+            result = self.tablebase.probe(board)
+            if result is not None:
+                return self.tablebase_eval(result, depth, maximizing), None
+
+        if depth == 0:
+            if self.quiescence_search:
+                return self.quiescence(board, maximizing, alpha, beta, ply), None
+            return self.static_eval(board), None  # eval, move
+
+        # transposition table
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.tt.probe(board.hash)
+        if entry is not None:
+            tt_depth, bound, tt_eval, code = entry
+            if code:
+                tt_move = code
+                if tt_depth >= depth:
+                    if bound == EXACT:
+                        return tt_eval, tt_move
+                    elif bound == LOWER:
+                        alpha = max(alpha, tt_eval)
+                    elif bound == UPPER:
+                        beta = min(beta, tt_eval)
+                    if beta <= alpha:
+                        return tt_eval, tt_move
+
+        color = 'white' if maximizing else 'black'
+        in_check = board.is_in_check(color)
+
+        # null move pruning: if passing the turn still fails high, a move will too.
+        # Not in check, not twice in a row and not with only pawns left (zugzwang)
+        if (self.null_move and ply > 0 and depth > NULL_MOVE_R and not in_check
+                and board.history and board.history[-1].piece is not None
+                and board.occupied[color] & ~(board.bitboards[color]['pawn'] | board.bitboards[color]['king'])):
+            if maximizing and beta < math.inf:
+                board.make_null_move()
+                eval = self.minimax(board, depth-1-NULL_MOVE_R, False, beta - WINDOW, beta, ply+1)[0]
+                board.unmake_move()
+                if eval >= beta:
+                    return beta, None
+            elif not maximizing and alpha > -math.inf:
+                board.make_null_move()
+                eval = self.minimax(board, depth-1-NULL_MOVE_R, True, alpha, alpha + WINDOW, ply+1)[0]
+                board.unmake_move()
+                if eval <= alpha:
+                    return alpha, None
+
+        moves = self.get_moves(board, color)
+
+        # no moves: checkmate or stalemate
+        if not moves:
+            if in_check:
+                mate = 10000 + depth # sooner mates score higher
+                return (-mate if maximizing else mate), None
+            return 0, None
+
+        # search the principal variation (or else the best move from the table) first
+        first = self.pv.get(board.hash, tt_move)
+        moves = self.order_moves(board, moves, ply, first)
+        
+        # late move reductions: quiet moves ordered late are searched less deep
+        reduce = self.reductions and depth >= 3 and not in_check
+
+        if maximizing:
+            max_eval = -math.inf
+            best_move = None
+            for i, move in enumerate(moves):
+                self.explored += 1
+                quiet = reduce and i >= LMR_MOVES and self.quiet(board, move)
+                board.make_move(move)
+                if quiet and not board.is_in_check('black'):
+                    eval = self.minimax(board, depth-2, False, alpha, alpha + WINDOW, ply+1)[0]
+                    # better than expected: search it again at full depth
+                    if eval > alpha:
+                        eval = self.minimax(board, depth-1, False, alpha, beta, ply+1)[0]
+                else:
+                    eval = self.minimax(board, depth-1, False, alpha, beta, ply+1)[0]  # eval, move
+                board.unmake_move()
+                if eval > max_eval:
+                    max_eval = eval
+                    best_move = move
+
+                alpha = max(alpha, max_eval)
+                if beta <= alpha: 
+                    self.cutoff(board, move, depth, ply)
+                    break
+
+            if best_move is None:
+                best_move = moves[0]
+            best_eval = max_eval
+        
+        else:
+            min_eval = math.inf
+            best_move = None
+            for i, move in enumerate(moves):
+                self.explored += 1
+                quiet = reduce and i >= LMR_MOVES and self.quiet(board, move)
+                board.make_move(move)
+                if quiet and not board.is_in_check('white'):
+                    eval = self.minimax(board, depth-2, True, beta - WINDOW, beta, ply+1)[0]
+                    # better than expected: search it again at full depth
+                    if eval < beta:
+                        eval = self.minimax(board, depth-1, True, alpha, beta, ply+1)[0]
+                else:
+                    eval = self.minimax(board, depth-1, True, alpha, beta, ply+1)[0]  # eval, move
+                board.unmake_move()
+                if eval < min_eval:
+                    min_eval = eval
+                    best_move = move
+
+                beta = min(beta, min_eval)
+                if beta <= alpha: 
+                    self.cutoff(board, move, depth, ply)
+                    break
+            
+            if best_move is None:
+                best_move = random.choice(moves)
+            best_eval = min_eval
+
+        # store the result with the kind of bound it is
+        if best_eval <= alpha_orig:
+            bound = UPPER
+        elif best_eval >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(board.hash, depth, bound, best_eval, best_move)
+
+        return best_eval, best_move  # eval, move
+
+    def tablebase_eval(self, result, depth, maximizing):
+        # a win or loss in n plies scores like the mate the search would find n plies deeper
+        wdl, plies = result
+        if not wdl:
+            return 0
+        mate = 10000 + depth - plies
+        return mate if (wdl > 0) == maximizing else -mate
+
+    def quiet(self, board, move):
+        # not a capture (en passant included) nor a promotion
+        final = move >> 6 & 63
+        if board.squares[final >> 3][final & 7].piece is not None:
+            return False
+        return move & FLAGS != PROMOTION and move & FLAGS != EN_PASSANT
+
+    def capturers(self, board, color):
+        '''
+            Bitboard of the pieces that may have a capture or a promotion, so the
+            quiescence search doesn't generate the moves of the other pieces
+        '''
+        enemy = 'black' if color == 'white' else 'white'
+        pieces = 0
+        for sq in bits(board.occupied[enemy]):
+            pieces |= board.attackers(sq, color)
+        pawns = board.bitboards[color]['pawn']
+        # pawns about to promote
+        pieces |= pawns & (0xFF << 8 if color == 'white' else 0xFF << 48)
+        # pawns next to a pawn that can be captured en passant
+        if board.en_passant is not None:
+            pieces |= pawns & (0xFF << (24 if color == 'white' else 32))
+        return pieces
+
+    def noisy_moves(self, board, moves):
+        # captures (en passant included) and promotions
+        return [move for move in moves if not self.quiet(board, move)]
+
+    def quiescence(self, board, maximizing, alpha, beta, ply, qply=0):
+        '''
+            Search only captures and promotions (every move when in check) until the
+            position is quiet, so the leaves aren't evaluated in the middle of an exchange
+        '''
+        if self.explored % 1024 == 0 and self.out_of_time():
+            raise SearchTimeout()
+
+        color = 'white' if maximizing else 'black'
+        enemy = 'black' if maximizing else 'white'
+        in_check = board.is_in_check(color)
+
+        # stand pat: the side to move can always decline the captures
+        if not in_check:
+            stand_pat = self.static_eval(board)
+            if qply >= QUIESCENCE_PLY:
+                return stand_pat
+            if maximizing:
+                if stand_pat >= beta:
+                    return stand_pat
+                alpha = max(alpha, stand_pat)
+            else:
+                if stand_pat <= alpha:
+                    return stand_pat
+                beta = min(beta, stand_pat)
+            # nothing to capture and no pawn about to promote: quiet
+            promoting = board.bitboards[color]['pawn'] & (0xFF << 8 if maximizing else 0xFF << 48)
+            if not board.attack_map(color) & board.occupied[enemy] and not promoting:
+                return stand_pat
+        elif qply >= QUIESCENCE_PLY:
+            return self.static_eval(board)
+
+        if in_check:
+            # check evasions: every legal move
+            moves = self.get_moves(board, color)
+            if not moves:
+                return -10000 if maximizing else 10000
+        else:
+            moves = self.noisy_moves(board, self.get_moves(board, color, self.capturers(board, color)))
+            if not moves:
+                return stand_pat
+        moves = self.order_moves(board, moves, min(ply, MAX_PLY))
+
+        best_eval = -math.inf if maximizing else math.inf
+        if not in_check:
+            best_eval = stand_pat
+        for move in moves:
+            # delta pruning: skip captures that can't bring the eval back to the bound
+            final = move >> 6 & 63
+            victim = board.squares[final >> 3][final & 7].piece
+            if not in_check and victim is not None and move & FLAGS != PROMOTION:
+                gain = abs(victim.value) + DELTA
+                if (maximizing and stand_pat + gain <= alpha) or (not maximizing and stand_pat - gain >= beta):
+                    continue
+
+            self.explored += 1
+            board.make_move(move)
+            eval = self.quiescence(board, not maximizing, alpha, beta, ply+1, qply+1)
+            board.unmake_move()
+
+            if maximizing:
+                best_eval = max(best_eval, eval)
+                alpha = max(alpha, eval)
+            else:
+                best_eval = min(best_eval, eval)
+                beta = min(beta, eval)
+            if beta <= alpha:
+                break
+
+        return best_eval
+
+    def search_root(self, board, depth, maximizing):
+        '''
+            Search the root position, splitting the root moves across worker
+            processes when self.workers > 1
+        '''
+        if self.workers <= 1:
+            return self.minimax(board, depth, maximizing, -math.inf, math.inf)
+
+        color = 'white' if maximizing else 'black'
+        moves = self.get_moves(board, color)
+        if not moves:
+            return self.minimax(board, depth, maximizing, -math.inf, math.inf)
+
+        # workers are started once and kept for the next searches
+        if self.parallel is None:
+            from .parallel import ParallelSearch # (parallel imports this module)
+            self.parallel = ParallelSearch(self.workers, self.tt_size, self.ordering)
+        if self.stopped:
+            raise SearchTimeout()
+
+        entry = self.tt.probe(board.hash)
+        tt_move = entry[3] if entry is not None and entry[3] else None
+        moves = self.order_moves(board, moves, 0, self.pv.get(board.hash, tt_move))
+        try:
+            eval, move, explored = self.parallel.search(board, moves, depth, maximizing, self.deadline)
+        finally:
+            self.explored += self.parallel.explored
+
+        # keep the root move in this process' table for the principal variation
+        self.tt.store(board.hash, depth, EXACT, eval, move)
+        return eval, move
+
+    def principal_variation(self, board, depth):
+        '''
+            Follow the best moves stored in the transposition table from the board
+        '''
+        pv = []
+        for i in range(depth):
+            entry = self.tt.probe(board.hash)
+            if entry is None or not entry[3]:
+                break
+            move = entry[3]
+            piece = board.squares[(move & 63) >> 3][move & 7].piece
+            if piece is None or piece.color != board.next_player:
+                break
+            pv.append((board.hash, move))
+            board.make_move(move)
+
+        for i in range(len(pv)):
+            board.unmake_move()
+        return pv
+
+    def iterative_deepening(self, board, report=None):
+        '''
+            Search depth 1, 2, ... until self.depth or the time budget runs out,
+            keeping the best move of the last completed depth.
+            report(depth, eval, move, seconds, pv) is called after every completed
+            depth instead of printing it.
+        '''
+        self.pv = {}
+        self.deadline = None
+        self.max_nodes = None
+        self.killers = [[0, 0] for ply in range(MAX_PLY)]
+        self.age_history()
+        start = time.time()
+        history = len(board.history)
+        maximizing = board.next_player == 'white'
+        best_eval, best_move = None, None
+
+        for depth in range(1, self.depth + 1):
+            try:
+                eval, move = self.search_root(board, depth, maximizing)
+            except SearchTimeout:
+                # abort: take back the moves of the unfinished search
+                while len(board.history) > history:
+                    board.unmake_move()
+                if report is None:
+                    print(f'- Depth {depth} aborted ({"stopped" if self.stopped else "out of time"})')
+                break
+
+            best_eval, best_move = eval, move
+            pv = self.principal_variation(board, depth)
+            if report is not None:
+                report(depth, eval, move, time.time() - start, [move for hash, move in pv])
+            else:
+                print(f'- Depth {depth}: eval {eval}, move {Move.decode(move)}, boards explored {self.explored}, {time.time() - start:.2f}s')
+
+            # order the next depth by this principal variation
+            self.pv = dict(pv)
+
+            # the first depth always completes, the next ones must fit the time budget
+            if self.time_limit is not None:
+                self.deadline = start + self.time_limit
+            self.max_nodes = self.node_limit
+
+        self.deadline = None
+        self.max_nodes = None
+        self.pv = {}
+        return best_eval, best_move
+
+    def stop(self):
+        # cancel a running search (safe to call from another thread)
+        self.stopped = True
+        if self.parallel is not None:
+            self.parallel.stop()
+
+    # MAIN EVAL
+    
+    def eval(self, main_board):
+        self.explored = 0
+        self.tt.new_search()
+
+        # add last move
+        last_move = main_board.last_move
+        self.game_moves.append(last_move)
+
+        # book engine
+        if self.engine == 'book':
+            move = self.book_move(main_board)
+
+            # no more book moves ?
+            if move is None:
+                self.engine = 'minimax'
+
+        # minimax engine
+        if self.engine == 'minimax':
+            print('\nFinding best move...')
+            eval, move = self.iterative_deepening(main_board)
+            if move is None:
+                return None
+            move = Move.decode(move) # (the search works with packed ints)
+            print('\n- Initial eval:', self.static_eval(main_board))
+            print('- Final eval:', eval)
+            print('- Boards explored', self.explored)
+            if eval >= 5000: 
+                print('* White MATE!')
+            if eval <= -5000: 
+                print('* Black MATE!')
+            
+        self.game_moves.append(move)
+        return move
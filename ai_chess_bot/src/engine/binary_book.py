@@ -0,0 +1,91 @@
+"""
+binary_book.py
+----------
+Binary opening book for Royal Gambit, in the layout of a Polyglot book: 16-byte
+big-endian entries (position key, move, weight, learn) sorted by key. The keys are
+the board's own zobrist hashes and the moves are packed ints (see move.py), so a
+position is found by binary search whatever move order reached it.
+The file is memory-mapped: opening a book doesn't read it.
+"""
+
+import mmap, os, random, struct
+
+ENTRY = struct.Struct('>QHHI') # key, move, weight, learn
+MAX_WEIGHT = 0xFFFF
+# book shipped with the game (converted from the tree in book.py)
+BOOK_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'books', 'book.bin'))
+
+class BinaryBook:
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.size = size // ENTRY.size # number of entries
+        # (an empty file can't be mapped)
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def close(self):
+        if self.size:
+            self.data.close()
+        self.file.close()
+
+    def entry(self, i):
+        return ENTRY.unpack_from(self.data, i * ENTRY.size)
+
+    def moves(self, key):
+        '''
+            Book moves of a position: [(move, weight)], best first
+        '''
+        # first entry with the key (lower bound)
+        low, high = 0, self.size
+        while low < high:
+            mid = (low + high) // 2
+            if self.entry(mid)[0] < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        moves = []
+        for i in range(low, self.size):
+            entry_key, move, weight, learn = self.entry(i)
+            if entry_key != key:
+                break
+            moves.append((move, weight))
+        return moves
+
+    def next_move(self, key, weighted=True):
+        '''
+            A book move of the position (packed int), picked by weight, or None
+        '''
+        moves = self.moves(key)
+        if not moves:
+            return None
+        if not weighted:
+            return moves[0][0]
+        return random.choices([move for move, weight in moves],
+                              [max(weight, 1) for move, weight in moves])[0]
+
+    @staticmethod
+    def write(path, entries):
+        '''
+            Write (key, move, weight) entries as a book. The weights of each position
+            are scaled to 16 bits.
+        '''
+        positions = {}
+        for key, move, weight in entries:
+            positions.setdefault(key, []).append((move, weight))
+
+        rows = []
+        for key, moves in positions.items():
+            scale = MAX_WEIGHT / max(max(weight for move, weight in moves), 1)
+            for move, weight in moves:
+                rows.append((key, move, max(round(weight * scale), 1)))
+        # by key, then best move first
+        rows.sort(key=lambda row: (row[0], -row[2]))
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as file:
+            for key, move, weight in rows:
+                file.write(ENTRY.pack(key, move, weight, 0))
+        return len(rows)
@@ -0,0 +1,162 @@
+"""
+bitboard.py
+----------
+Bitboard helpers and precomputed attack tables for Royal Gambit.
+A bitboard is a 64-bit int with one bit per square, indexed as row * 8 + col
+(a8 = 0, h1 = 63), the same orientation as Board.squares.
+"""
+
+from .const import ROWS, COLS
+
+PIECE_NAMES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+FULL = (1 << 64) - 1
+
+def square(row, col):
+    return row * COLS + col
+
+def bits(bb):
+    '''
+        Yield the index of every set bit (lowest first)
+    '''
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+def lsb(bb):
+    return (bb & -bb).bit_length() - 1
+
+def popcount(bb):
+    return bin(bb).count('1')
+
+def _in_range(row, col):
+    return 0 <= row < ROWS and 0 <= col < COLS
+
+def _leaper_table(offsets):
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, COLS)
+        bb = 0
+        for row_incr, col_incr in offsets:
+            if _in_range(row + row_incr, col + col_incr):
+                bb |= 1 << square(row + row_incr, col + col_incr)
+        table.append(bb)
+    return table
+
+FILE_A = sum(1 << square(row, 0) for row in range(ROWS))
+FILE_H = sum(1 << square(row, 7) for row in range(ROWS))
+
+KNIGHT_ATTACKS = _leaper_table([(-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1)])
+KING_ATTACKS = _leaper_table([(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)])
+# squares attacked by a pawn of the given color (white moves up the board)
+PAWN_ATTACKS = {
+    'white': _leaper_table([(-1, -1), (-1, 1)]),
+    'black': _leaper_table([(1, -1), (1, 1)]),
+}
+
+def pawn_attacks(pawns, color):
+    '''
+        Squares attacked by all the pawns of a bitboard at once
+    '''
+    if color == 'white':
+        return ((pawns & ~FILE_A) >> 9) | ((pawns & ~FILE_H) >> 7)
+    return (((pawns & ~FILE_A) << 7) | ((pawns & ~FILE_H) << 9)) & FULL
+
+# ----------------
+# SLIDING PIECES
+# ----------------
+
+# every line is described by the two opposite directions that form it
+RANK = ((0, 1), (0, -1))
+FILE = ((1, 0), (-1, 0))
+DIAGONAL = ((1, 1), (-1, -1))
+ANTI_DIAGONAL = ((1, -1), (-1, 1))
+
+def _ray(sq, incr, occ=None):
+    '''
+        Squares from sq in one direction, stopping at (and including) the first
+        blocker in occ. With occ=None the full ray is returned.
+    '''
+    row, col = divmod(sq, COLS)
+    row_incr, col_incr = incr
+    bb = 0
+    row, col = row + row_incr, col + col_incr
+    while _in_range(row, col):
+        bb |= 1 << square(row, col)
+        if occ is not None and occ & (1 << square(row, col)):
+            break
+        row, col = row + row_incr, col + col_incr
+    return bb
+
+def _ray_end(sq, incr):
+    row, col = divmod(sq, COLS)
+    row_incr, col_incr = incr
+    while _in_range(row + row_incr, col + col_incr):
+        row, col = row + row_incr, col + col_incr
+    return square(row, col)
+
+def _line_tables(line):
+    '''
+        For every square: the relevant occupancy mask of the line (edges excluded,
+        they never block anything) and a table mapping each masked occupancy to the
+        attacked squares. The masked occupancy is used directly as the lookup key.
+    '''
+    masks = []
+    tables = []
+    for sq in range(64):
+        mask = 0
+        for incr in line:
+            ray = _ray(sq, incr)
+            # the last square of a ray can't block anything
+            if ray:
+                mask |= ray & ~(1 << _ray_end(sq, incr))
+        table = {}
+        # enumerate every subset of the mask (carry-rippler)
+        occ = 0
+        while True:
+            attacks = 0
+            for incr in line:
+                attacks |= _ray(sq, incr, occ)
+            table[occ] = attacks
+            occ = (occ - mask) & mask
+            if occ == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+RANK_MASKS, RANK_ATTACKS = _line_tables(RANK)
+FILE_MASKS, FILE_ATTACKS = _line_tables(FILE)
+DIAGONAL_MASKS, DIAGONAL_ATTACKS = _line_tables(DIAGONAL)
+ANTI_DIAGONAL_MASKS, ANTI_DIAGONAL_ATTACKS = _line_tables(ANTI_DIAGONAL)
+
+def rook_attacks(sq, occ):
+    return (RANK_ATTACKS[sq][occ & RANK_MASKS[sq]] |
+            FILE_ATTACKS[sq][occ & FILE_MASKS[sq]])
+
+def bishop_attacks(sq, occ):
+    return (DIAGONAL_ATTACKS[sq][occ & DIAGONAL_MASKS[sq]] |
+            ANTI_DIAGONAL_ATTACKS[sq][occ & ANTI_DIAGONAL_MASKS[sq]])
+
+def queen_attacks(sq, occ):
+    return rook_attacks(sq, occ) | bishop_attacks(sq, occ)
+
+def _between_table():
+    '''
+        BETWEEN[a][b]: squares strictly between a and b when they share a rank,
+        file or diagonal (0 otherwise)
+    '''
+    between = [[0] * 64 for sq in range(64)]
+    for sq in range(64):
+        for incr in RANK + FILE + DIAGONAL + ANTI_DIAGONAL:
+            row, col = divmod(sq, COLS)
+            row_incr, col_incr = incr
+            bb = 0
+            row, col = row + row_incr, col + col_incr
+            while _in_range(row, col):
+                between[sq][square(row, col)] = bb
+                bb |= 1 << square(row, col)
+                row, col = row + row_incr, col + col_incr
+    return between
+
+BETWEEN = _between_table()
@@ -0,0 +1,655 @@
+"""
+board.py
+----------
+Board representation and logic for Royal Gambit.
+"""
+
+from .const import *
+from .square import Square, SQUARES
+from .piece import *
+from .move import Move, FLAGS, EN_PASSANT, CASTLING, QUEEN_PROMOTION
+from .undo import Undo
+from .bitboard import *
+from .zobrist import *
+from .pst import PST
+
+# FEN letter of each piece class (white pieces are upper case)
+FEN_PIECES = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+class Board:
+
+    def __init__(self, fen=None):
+        self.squares = [[0, 0, 0, 0, 0, 0, 0, 0] for col in range(COLS)]
+        self.last_code = None # last move as a packed int
+        self.next_player = 'white'
+        self.en_passant = None # pawn that can be captured en passant
+        self.en_passant_col = None
+        self.history = [] # undo records of the moves made
+        # zobrist key of the position, updated incrementally as pieces move
+        self.hash = 0
+        # white - black material and heatmap scores, updated incrementally as pieces move
+        self.material = 0
+        self.positional = 0
+        # check and pin masks of the last position they were computed for
+        self._masks = None
+        # bitboards: one int per piece type and color, plus the occupancy of each color
+        self.bitboards = {color: {name: 0 for name in PIECE_NAMES} for color in ('white', 'black')}
+        self.occupied = {'white': 0, 'black': 0}
+        self.king_square = {'white': None, 'black': None}
+        # squares attacked by each color (None until needed after a move)
+        self.attack_maps = {'white': None, 'black': None}
+        self._create()
+        if fen is None:
+            self._add_pieces('white')
+            self._add_pieces('black')
+        else:
+            self._load_fen(fen)
+        self.castling_state = self.castling_rights()
+        self.hash ^= CASTLING_KEYS[self.castling_state]
+
+    @property
+    def last_move(self):
+        return Move.decode(self.last_code) if self.last_code is not None else None
+
+    def move(self, piece, move):
+        '''
+            Make a move of the game (a Move): returns the undo record, so the caller
+            can tell what was captured (see move_events)
+        '''
+        undo = self.make_move(move.encode())
+
+        # clear valid moves
+        piece.clear_moves()
+        return undo
+
+    def move_events(self, undo):
+        '''
+            What the last move (its undo record) did, for the front-end: a tuple of
+            'capture', 'castle', 'promote' and 'check'
+        '''
+        events = []
+        if undo.captured is not None:
+            events.append('capture')
+        if undo.rook is not None:
+            events.append('castle')
+        if undo.promotion is not None:
+            events.append('promote')
+        if self.is_in_check(self.next_player):
+            events.append('check')
+        return tuple(events)
+
+    def make_move(self, move):
+        '''
+            Make a move (packed int) on the board and store everything needed to take it
+            back (captured piece, moved flags, en passant state, castling rook and promotion)
+        '''
+        initial_row, initial_col = divmod(move & 63, COLS)
+        final_row, final_col = divmod(move >> 6 & 63, COLS)
+        piece = self.squares[initial_row][initial_col].piece
+        undo = Undo(piece, move, piece.moved, self.en_passant, self.last_code)
+        undo.en_passant_col = self.en_passant_col
+        undo.castling_state = self.castling_state
+        undo.hash = self.hash
+        undo.attack_maps = self.attack_maps
+        undo.material = self.material
+        undo.positional = self.positional
+        self.attack_maps = {'white': None, 'black': None}
+
+        # en passant file key (before the pieces move, as it was hashed)
+        if self.en_passant is not None:
+            self.hash ^= self.en_passant_key(self.en_passant_col, self.next_player)
+
+        # captured piece
+        if self.squares[final_row][final_col].piece is not None:
+            undo.captured = self._remove(final_row, final_col)
+            undo.captured_row, undo.captured_col = final_row, final_col
+
+        # en passant capture
+        elif isinstance(piece, Pawn) and final_col != initial_col:
+            undo.captured = self._remove(initial_row, final_col)
+            undo.captured_row, undo.captured_col = initial_row, final_col
+
+        # console board move update
+        self._remove(initial_row, initial_col)
+        self._put(piece, final_row, final_col)
+
+        # pawn promotion
+        if isinstance(piece, Pawn):
+            undo.promotion = self.check_promotion(piece, final_row, final_col)
+
+        # king castling
+        if isinstance(piece, King) and abs(final_col - initial_col) == 2:
+            rook_col, rook_final_col = (0, 3) if final_col < initial_col else (7, 5)
+            rook = self.squares[initial_row][rook_col].piece
+            undo.rook = rook
+            undo.rook_moved = rook.moved
+            undo.rook_initial_col, undo.rook_final_col = rook_col, rook_final_col
+            self._remove(initial_row, rook_col)
+            self._put(rook, initial_row, rook_final_col)
+            rook.moved = True
+
+        # en passant state
+        if isinstance(piece, Pawn) and abs(final_row - initial_row) == 2:
+            self.set_true_en_passant(piece)
+            self.en_passant_col = final_col
+            self.hash ^= self.en_passant_key(final_col, 'black' if piece.color == 'white' else 'white')
+        elif self.en_passant is not None:
+            self.en_passant.en_passant = False
+            self.en_passant = None
+            self.en_passant_col = None
+
+        # move
+        piece.moved = True
+
+        # castling rights
+        if isinstance(piece, (King, Rook)) or isinstance(undo.captured, Rook):
+            self.hash ^= CASTLING_KEYS[self.castling_state]
+            self.castling_state = self.castling_rights()
+            self.hash ^= CASTLING_KEYS[self.castling_state]
+
+        # side to move
+        self.next_player = 'black' if piece.color == 'white' else 'white'
+        self.hash ^= SIDE_KEY
+
+        # set last move
+        self.last_code = move
+
+        self.history.append(undo)
+        return undo
+
+    def make_null_move(self):
+        '''
+            Pass the turn to the other player (used by the search for null move pruning).
+            Taken back with unmake_move like any other move.
+        '''
+        undo = Undo(None, None, False, self.en_passant, self.last_code)
+        undo.en_passant_col = self.en_passant_col
+        undo.castling_state = self.castling_state
+        undo.hash = self.hash
+        undo.attack_maps = self.attack_maps # the pieces don't move
+        undo.material = self.material
+        undo.positional = self.positional
+
+        # en passant state
+        if self.en_passant is not None:
+            self.hash ^= self.en_passant_key(self.en_passant_col, self.next_player)
+            self.en_passant.en_passant = False
+            self.en_passant = None
+            self.en_passant_col = None
+
+        # side to move
+        self.next_player = 'black' if self.next_player == 'white' else 'white'
+        self.hash ^= SIDE_KEY
+        self.last_code = None
+
+        self.history.append(undo)
+        return undo
+
+    def unmake_move(self):
+        '''
+            Take back the last move made with make_move (or make_null_move)
+        '''
+        undo = self.history.pop()
+
+        # null move
+        if undo.piece is None:
+            self.en_passant = undo.en_passant
+            self.en_passant_col = undo.en_passant_col
+            if self.en_passant is not None:
+                self.en_passant.en_passant = True
+            self.next_player = 'black' if self.next_player == 'white' else 'white'
+            self.last_code = undo.last_move
+            self.hash = undo.hash
+            return undo
+
+        piece = undo.piece
+        initial_row, initial_col = divmod(undo.move & 63, COLS)
+        final_row, final_col = divmod(undo.move >> 6 & 63, COLS)
+
+        # castling rook
+        if undo.rook is not None:
+            self._remove(initial_row, undo.rook_final_col)
+            self._put(undo.rook, initial_row, undo.rook_initial_col)
+            undo.rook.moved = undo.rook_moved
+
+        # console board move update (also removes the promoted queen)
+        self._remove(final_row, final_col)
+        self._put(piece, initial_row, initial_col)
+
+        # captured piece
+        if undo.captured is not None:
+            self._put(undo.captured, undo.captured_row, undo.captured_col)
+
+        # en passant state
+        if self.en_passant is not None:
+            self.en_passant.en_passant = False
+        self.en_passant = undo.en_passant
+        self.en_passant_col = undo.en_passant_col
+        if self.en_passant is not None:
+            self.en_passant.en_passant = True
+
+        piece.moved = undo.moved
+        self.last_code = undo.last_move
+        self.castling_state = undo.castling_state
+        self.next_player = piece.color
+        self.hash = undo.hash
+        self.attack_maps = undo.attack_maps
+        self.material = undo.material
+        self.positional = undo.positional
+        return undo
+
+    def reset(self):
+        '''
+            Take back every move: back to the position the board was created with,
+            keeping its squares and pieces
+        '''
+        while self.history:
+            self.unmake_move()
+        for row in range(ROWS):
+            for col in range(COLS):
+                if self.squares[row][col].has_piece():
+                    self.squares[row][col].piece.clear_moves()
+
+    def valid_move(self, piece, move):
+        return move in piece.moves
+
+    def check_promotion(self, piece, row, col):
+        if row == 0 or row == 7:
+            queen = Queen(piece.color)
+            self._remove(row, col)
+            self._put(queen, row, col)
+            return queen
+
+    def castling(self, initial, final):
+        return abs(initial.col - final.col) == 2
+
+    def castling_rights(self):
+        '''
+            Castling rights as 4 bits (white king side, white queen side,
+            black king side, black queen side), from the king and rook moved flags
+        '''
+        rights = 0
+        for bit, color, row, rook_col in [(1, 'white', 7, 7), (2, 'white', 7, 0),
+                                          (4, 'black', 0, 7), (8, 'black', 0, 0)]:
+            king = self.squares[row][4].piece
+            rook = self.squares[row][rook_col].piece
+            if isinstance(king, King) and king.color == color and not king.moved:
+                if isinstance(rook, Rook) and rook.color == color and not rook.moved:
+                    rights |= bit
+        return rights
+
+    def en_passant_key(self, col, color):
+        '''
+            Zobrist key of the en passant file, hashed only when a pawn of color (the side
+            to move) can actually take (as in Polyglot), so transpositions hash the same
+        '''
+        target = square(2 if color == 'white' else 5, col)
+        enemy = 'black' if color == 'white' else 'white'
+        if PAWN_ATTACKS[enemy][target] & self.bitboards[color]['pawn']:
+            return EN_PASSANT_KEYS[col]
+        return 0
+
+    def set_true_en_passant(self, piece):
+        if not isinstance(piece, Pawn):
+            return
+
+        if self.en_passant is not None:
+            self.en_passant.en_passant = False
+
+        piece.en_passant = True
+        self.en_passant = piece
+
+    def in_check(self, move):
+        # does the (packed) move leave the king of the moved piece in check ?
+        undo = self.make_move(move)
+        check = self.is_in_check(undo.piece.color)
+        self.unmake_move()
+        return check
+
+    def is_in_check(self, player):
+        """
+        Check if the given player's king is in check.
+        """
+        king = self.king_square[player]
+        if king is None:
+            return False  # No king found (should not happen in a valid game)
+
+        enemy = 'black' if player == 'white' else 'white'
+        return bool(self.attack_map(enemy) & (1 << king))
+
+    def attack_map(self, color):
+        """
+        Bitboard of the squares attacked by the given color. The enemy king doesn't
+        block sliders, so the squares behind it (where it can't step) count as attacked.
+        The map is computed once after each move and restored by unmake_move.
+        """
+        attacks = self.attack_maps[color]
+        if attacks is None:
+            enemy = 'black' if color == 'white' else 'white'
+            pieces = self.bitboards[color]
+            occupied = (self.occupied['white'] | self.occupied['black']) & ~self.bitboards[enemy]['king']
+
+            attacks = pawn_attacks(pieces['pawn'], color)
+            for sq in bits(pieces['knight']):
+                attacks |= KNIGHT_ATTACKS[sq]
+            for sq in bits(pieces['bishop'] | pieces['queen']):
+                attacks |= bishop_attacks(sq, occupied)
+            for sq in bits(pieces['rook'] | pieces['queen']):
+                attacks |= rook_attacks(sq, occupied)
+            if self.king_square[color] is not None:
+                attacks |= KING_ATTACKS[self.king_square[color]]
+
+            self.attack_maps[color] = attacks
+        return attacks
+
+    def attackers(self, sq, color, occupied=None):
+        """
+        Bitboard of the pieces of the given color attacking the square.
+        """
+        pieces = self.bitboards[color]
+        if occupied is None:
+            occupied = self.occupied['white'] | self.occupied['black']
+        enemy = 'black' if color == 'white' else 'white'
+
+        return ((KNIGHT_ATTACKS[sq] & pieces['knight']) |
+                (KING_ATTACKS[sq] & pieces['king']) |
+                (PAWN_ATTACKS[enemy][sq] & pieces['pawn']) |
+                (bishop_attacks(sq, occupied) & (pieces['bishop'] | pieces['queen'])) |
+                (rook_attacks(sq, occupied) & (pieces['rook'] | pieces['queen'])))
+
+    def legal_masks(self, color):
+        """
+        Check-evasion mask and pin rays for the given color, computed once per position.
+        - check: squares a non-king piece may move to (every square when not in check,
+          the checker and the squares in between in single check, none in double check)
+        - pins: square of each pinned piece -> squares it may move to along its pin ray
+        """
+        if self._masks is not None and self._masks[0] == self.hash and self._masks[1] == color:
+            return self._masks[2], self._masks[3]
+
+        king = self.king_square[color]
+        if king is None:
+            return FULL, {}
+
+        enemy = 'black' if color == 'white' else 'white'
+        pieces = self.bitboards[enemy]
+        team = self.occupied[color]
+        occupied = team | self.occupied[enemy]
+
+        # king attackers
+        checkers = 0
+        if self.attack_map(enemy) & (1 << king):
+            checkers = self.attackers(king, enemy, occupied)
+        if not checkers:
+            check = FULL
+        elif checkers & (checkers - 1):
+            check = 0
+        else:
+            check = checkers | BETWEEN[king][lsb(checkers)]
+
+        # pin rays: enemy sliders on a line with the king, with one team piece in between
+        pins = {}
+        snipers = ((rook_attacks(king, 0) & (pieces['rook'] | pieces['queen'])) |
+                   (bishop_attacks(king, 0) & (pieces['bishop'] | pieces['queen'])))
+        for sniper in bits(snipers):
+            blockers = BETWEEN[king][sniper] & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & team:
+                pins[lsb(blockers)] = BETWEEN[king][sniper] | (1 << sniper)
+
+        self._masks = (self.hash, color, check, pins)
+        return check, pins
+
+    def is_checkmate(self, player):
+        """
+        Check if the given player is in checkmate.
+        """
+        if not self.is_in_check(player):
+            return False  # Not in check, so cannot be checkmate
+
+        # no (legal) move can get the player out of check
+        return not self.generate(player)
+
+    def status(self):
+        '''
+            State of the game for the side to move: 'ongoing', 'check', 'checkmate'
+            or 'stalemate'
+        '''
+        check = self.is_in_check(self.next_player)
+        if not self.generate(self.next_player):
+            return 'checkmate' if check else 'stalemate'
+        return 'check' if check else 'ongoing'
+
+    def generate(self, color, pieces=None, legal=True):
+        '''
+            Moves of the color as packed ints (see move.py), only of the pieces in the
+            given bitboard when there is one. Legal moves unless legal=False.
+        '''
+        enemy_color = 'black' if color == 'white' else 'white'
+        bitboards = self.bitboards[color]
+        team = self.occupied[color]
+        enemy = self.occupied[enemy_color]
+        occupied = team | enemy
+        if pieces is None:
+            pieces = team
+
+        # legal moves: only the squares allowed by the check and pin masks
+        check, pins = self.legal_masks(color) if legal else (FULL, {})
+        moves = []
+        append = moves.append
+
+        # knights and sliders
+        for sq in bits(bitboards['knight'] & pieces):
+            for target in bits(KNIGHT_ATTACKS[sq] & ~team & check & pins.get(sq, FULL)):
+                append(sq | target << 6)
+        for sq in bits(bitboards['bishop'] & pieces):
+            for target in bits(bishop_attacks(sq, occupied) & ~team & check & pins.get(sq, FULL)):
+                append(sq | target << 6)
+        for sq in bits(bitboards['rook'] & pieces):
+            for target in bits(rook_attacks(sq, occupied) & ~team & check & pins.get(sq, FULL)):
+                append(sq | target << 6)
+        for sq in bits(bitboards['queen'] & pieces):
+            for target in bits(queen_attacks(sq, occupied) & ~team & check & pins.get(sq, FULL)):
+                append(sq | target << 6)
+
+        # pawns
+        white = color == 'white'
+        step, initial_row = (-COLS, 6) if white else (COLS, 1)
+        for sq in bits(bitboards['pawn'] & pieces):
+            targets = 0
+            # vertical moves (a pawn is never on the last row, one step is always on the board)
+            if not occupied & (1 << sq + step):
+                targets |= 1 << sq + step
+                if sq // COLS == initial_row and not occupied & (1 << sq + 2 * step):
+                    targets |= 1 << sq + 2 * step
+            # diagonal moves
+            targets |= PAWN_ATTACKS[color][sq] & enemy
+            for target in bits(targets & check & pins.get(sq, FULL)):
+                if target < COLS or target >= 56:
+                    append(sq | target << 6 | QUEEN_PROMOTION)
+                else:
+                    append(sq | target << 6)
+
+        # en passant: the pawns attacking the square the enemy pawn skipped
+        if self.en_passant is not None and self.en_passant.color != color:
+            target = square(2 if white else 5, self.en_passant_col)
+            for sq in bits(PAWN_ATTACKS[enemy_color][target] & bitboards['pawn'] & pieces):
+                move = sq | target << 6 | EN_PASSANT
+                # (the captured pawn may uncover the king: check by making the move)
+                if not legal or not self.in_check(move):
+                    append(move)
+
+        # king
+        king = self.king_square[color]
+        if king is not None and pieces & (1 << king):
+            # the king can't step onto attacked squares, also those behind it on the
+            # line of a checking slider
+            attacked = self.attack_map(enemy_color) if legal else 0
+            for target in bits(KING_ATTACKS[king] & ~team & ~attacked):
+                append(king | target << 6)
+
+            # castling: rights left, no pieces in between and (legal) not out of,
+            # through or into check
+            rights = self.castling_state >> (0 if white else 2)
+            row = square(7 if white else 0, 0)
+            if rights & 1 and not occupied & (0b01100000 << row) and not attacked & (0b01110000 << row):
+                append(king | row + 6 << 6 | CASTLING)
+            if rights & 2 and not occupied & (0b00001110 << row) and not attacked & (0b00011100 << row):
+                append(king | row + 2 << 6 | CASTLING)
+
+        return moves
+
+    def calc_moves(self, piece, row, col, bool=True):
+        '''
+            Calculate all the possible (valid) moves of an specific piece on a specific position
+        '''
+        for code in self.generate(piece.color, 1 << square(row, col), legal=bool):
+            move = Move.decode(code)
+            piece.add_move(move)
+
+            # castling: the rook can also be dragged to its castling square
+            if code & FLAGS == CASTLING:
+                rook_col, rook_final_col = (0, 3) if move.final.col < col else (7, 5)
+                rook = self.squares[row][rook_col].piece
+                rook.add_move(Move(SQUARES[square(row, rook_col)], SQUARES[square(row, rook_final_col)]))
+                if rook_col == 0:
+                    piece.left_rook = rook
+                else:
+                    piece.right_rook = rook
+
+    def _put(self, piece, row, col):
+        # place a piece on the squares and its bitboards
+        self.squares[row][col].piece = piece
+        sq = square(row, col)
+        self.bitboards[piece.color][piece.name] |= 1 << sq
+        self.occupied[piece.color] |= 1 << sq
+        self.hash ^= PIECE_KEYS[piece.color][piece.name][sq]
+        self.material += piece.value
+        self.positional += PST[piece.color][piece.name][sq]
+        if isinstance(piece, King):
+            self.king_square[piece.color] = sq
+
+    def _remove(self, row, col):
+        # lift the piece from the squares and its bitboards
+        piece = self.squares[row][col].piece
+        self.squares[row][col].piece = None
+        sq = square(row, col)
+        self.bitboards[piece.color][piece.name] &= ~(1 << sq)
+        self.occupied[piece.color] &= ~(1 << sq)
+        self.hash ^= PIECE_KEYS[piece.color][piece.name][sq]
+        self.material -= piece.value
+        self.positional -= PST[piece.color][piece.name][sq]
+        if isinstance(piece, King):
+            self.king_square[piece.color] = None
+        return piece
+
+    def fen(self):
+        '''
+            FEN of the position (the move counters aren't tracked: the halfmove
+            clock is always 0 and the fullmove number is counted from history)
+        '''
+        rows = []
+        for row in range(ROWS):
+            text, empty = '', 0
+            for col in range(COLS):
+                piece = self.squares[row][col].piece
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                letter = 'n' if piece.name == 'knight' else piece.name[0]
+                text += letter.upper() if piece.color == 'white' else letter
+            if empty:
+                text += str(empty)
+            rows.append(text)
+
+        castling = ''.join(letter for bit, letter in [(1, 'K'), (2, 'Q'), (4, 'k'), (8, 'q')]
+                           if self.castling_state & bit) or '-'
+        en_passant = '-'
+        if self.en_passant is not None:
+            # the square the pawn skipped
+            row = 5 if self.en_passant.color == 'white' else 2
+            en_passant = f'{Square.get_alphacol(self.en_passant_col)}{ROWS - row}'
+        player = self.next_player[0]
+        return f'{"/".join(rows)} {player} {castling} {en_passant} 0 {len(self.history) // 2 + 1}'
+
+    def _load_fen(self, fen):
+        '''
+            Place the pieces of a FEN position on the empty board and set the side to
+            move, the castling rights (as moved flags) and the en passant pawn
+        '''
+        fields = fen.split()
+        placement, player = fields[0], fields[1] if len(fields) > 1 else 'w'
+        castling = fields[2] if len(fields) > 2 else '-'
+        en_passant = fields[3] if len(fields) > 3 else '-'
+
+        for row, text in enumerate(placement.split('/')):
+            col = 0
+            for letter in text:
+                if letter.isdigit():
+                    col += int(letter)
+                    continue
+                color = 'white' if letter.isupper() else 'black'
+                piece = FEN_PIECES[letter.lower()](color)
+                # pawns off their initial row can't make a double move
+                if isinstance(piece, Pawn):
+                    piece.moved = row != (6 if color == 'white' else 1)
+                self._put(piece, row, col)
+                col += 1
+
+        # castling rights: the king and rooks that lost them count as moved
+        for color, row, king_side, queen_side in [('white', 7, 'K', 'Q'), ('black', 0, 'k', 'q')]:
+            king = self.squares[row][4].piece
+            if isinstance(king, King) and king.color == color:
+                king.moved = king_side not in castling and queen_side not in castling
+            for col, letter in [(7, king_side), (0, queen_side)]:
+                rook = self.squares[row][col].piece
+                if isinstance(rook, Rook) and rook.color == color:
+                    rook.moved = letter not in castling
+
+        # side to move
+        if player == 'b':
+            self.next_player = 'black'
+            self.hash ^= SIDE_KEY
+
+        # en passant: the pawn that just made a double move
+        if en_passant != '-':
+            col = ord(en_passant[0]) - ord('a')
+            row = 3 if self.next_player == 'white' else 4
+            pawn = self.squares[row][col].piece
+            if isinstance(pawn, Pawn):
+                self.set_true_en_passant(pawn)
+                self.en_passant_col = col
+                self.hash ^= self.en_passant_key(col, self.next_player)
+
+    def _create(self):
+        for row in range(ROWS):
+            for col in range(COLS):
+                self.squares[row][col] = Square(row, col)
+
+    def _add_pieces(self, color):
+        row_pawn, row_other = (6, 7) if color == 'white' else (1, 0)
+
+        # pawns
+        for col in range(COLS):
+            self._put(Pawn(color), row_pawn, col)
+
+        # knights
+        self._put(Knight(color), row_other, 1)
+        self._put(Knight(color), row_other, 6)
+
+        # bishops
+        self._put(Bishop(color), row_other, 2)
+        self._put(Bishop(color), row_other, 5)
+
+        # rooks
+        self._put(Rook(color), row_other, 0)
+        self._put(Rook(color), row_other, 7)
+
+        # queen
+        self._put(Queen(color), row_other, 3)
+
+        # king
+        self._put(King(color), row_other, 4)
@@ -3,9 +3,9 @@ book.py
 ----------
 Opening move book for Royal Gambit.
 """
-from move import Move
-from node import Node
-from square import Square
+from .move import Move
+from .node import Node
+from .square import Square
 
 class Book:
     
@@ -13,6 +13,31 @@ class Book:
         self.head = Node()
         self._create()
 
+    def entries(self):
+        '''
+            (position key, packed move, weight) of every move of the tree, to write it
+            as a BinaryBook
+        '''
+        from .board import Board # (the board isn't needed to play the tree)
+        board = Board()
+        entries = []
+
+        def walk(node):
+            for child in node.children:
+                # the generated move has the flags of the packed move
+                code = child.value.encode()
+                moves = [move for move in board.generate(board.next_player) if move & 0xFFF == code]
+                if not moves:
+                    continue # not legal in the position (the tree isn't checked)
+                move = moves[0]
+                entries.append((board.hash, move, child.weight))
+                board.make_move(move)
+                walk(child)
+                board.unmake_move()
+
+        walk(self.head)
+        return entries
+
     def next_move(self, game_moves, weighted=True):
         for i, move in enumerate(game_moves):
             if i == 0: node = self.head
@@ -0,0 +1,9 @@
+"""
+const.py
+----------
+Board constants for the Royal Gambit engine.
+"""
+
+# Board dimensions
+ROWS = 8
+COLS = 8
@@ -0,0 +1,55 @@
+"""
+move.py
+----------
+Defines the Move class for representing chess moves.
+The search works with moves packed into ints (16 bits, like the transposition
+table entries): initial square in bits 0-5, final square in bits 6-11, promotion
+piece in bits 12-13 and a flag in bits 14-15. Move objects are only built for the
+GUI and the book.
+"""
+
+from .square import SQUARES
+
+# flags
+NORMAL = 0
+PROMOTION = 1 << 14
+EN_PASSANT = 2 << 14
+CASTLING = 3 << 14
+FLAGS = 3 << 14
+
+# promotion pieces (the board always promotes to a queen)
+PROMOTION_PIECES = ('knight', 'bishop', 'rook', 'queen')
+QUEEN_PROMOTION = PROMOTION | 3 << 12
+
+class Move:
+
+    __slots__ = ('initial', 'final')
+
+    def __init__(self, initial, final):
+        # initial and final are squares
+        self.initial = initial
+        self.final = final
+
+    def __str__(self):
+        s = ''
+        s += f'({self.initial.col}, {self.initial.row})'
+        s += f' -> ({self.final.col}, {self.final.row})'
+        return s
+
+    def __eq__(self, other):
+        return self.initial == other.initial and self.final == other.final
+
+    def coordinates(self):
+        # coordinate notation used by UCI, e.g. 'e2e4'
+        initial, final = self.initial, self.final
+        return f'{initial.alphacol}{8 - initial.row}{final.alphacol}{8 - final.row}'
+
+    def encode(self):
+        # pack the squares into an int (the board finds the flags itself when making it)
+        initial = self.initial.row * 8 + self.initial.col
+        final = self.final.row * 8 + self.final.col
+        return initial | final << 6
+
+    @staticmethod
+    def decode(code):
+        return Move(SQUARES[code & 63], SQUARES[code >> 6 & 63])
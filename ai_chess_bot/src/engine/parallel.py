@@ -0,0 +1,106 @@
+"""
+parallel.py
+----------
+Multi-core search for the Royal Gambit AI (root splitting).
+The root moves are searched in a pool of worker processes, each with its own AI
+and transposition table, sharing the best root eval found so far as the bound
+for the moves that start after it.
+"""
+
+import math, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .ai import AI, SearchTimeout
+
+# state of each worker process
+_ai = None
+_bound = None
+_stop = None
+
+class _WorkerAI(AI):
+    # the stop flag of a worker is shared with the main process
+
+    @property
+    def stopped(self):
+        return bool(_stop.value)
+
+    @stopped.setter
+    def stopped(self, value):
+        pass
+
+def _init_worker(bound, stop, tt_size, ordering):
+    global _ai, _bound, _stop
+    _bound, _stop = bound, stop
+    _ai = _WorkerAI(engine='minimax', tt_size=tt_size, ordering=ordering)
+
+def _search_move(board, move, depth, maximizing, deadline):
+    '''
+        Search one root move in a worker: (eval or None if aborted, boards explored)
+    '''
+    _ai.explored = 0
+    _ai.deadline = deadline
+
+    # only a better eval than the best root move so far matters
+    with _bound.get_lock():
+        bound = _bound.value
+    alpha, beta = (bound, math.inf) if maximizing else (-math.inf, bound)
+
+    board.make_move(move)
+    try:
+        eval = _ai.minimax(board, depth - 1, not maximizing, alpha, beta, 1)[0]
+    except SearchTimeout:
+        return None, _ai.explored
+
+    with _bound.get_lock():
+        if (maximizing and eval > _bound.value) or (not maximizing and eval < _bound.value):
+            _bound.value = eval
+    return eval, _ai.explored
+
+class ParallelSearch:
+
+    def __init__(self, workers, tt_size=16, ordering=True):
+        # spawn: forking a process that runs pygame and threads isn't safe
+        context = multiprocessing.get_context('spawn')
+        self.workers = workers
+        self.bound = context.Value('d', 0.0)
+        self.stop_flag = context.Value('b', 0)
+        self.explored = 0 # boards explored by the workers in the last search
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker,
+            initargs=(self.bound, self.stop_flag, tt_size, ordering))
+
+    def search(self, board, moves, depth, maximizing, deadline=None):
+        '''
+            Search the (ordered) root moves: (eval, move, boards explored).
+            Raises SearchTimeout if the search didn't finish every move.
+        '''
+        self.bound.value = -math.inf if maximizing else math.inf
+        self.stop_flag.value = 0
+        self.explored = 0
+
+        # the first (best ordered) move is searched alone to set the bound for the others
+        first = self.executor.submit(_search_move, board, moves[0], depth, maximizing, deadline)
+        results = [(moves[0], first.result())]
+        if results[0][1][0] is not None:
+            futures = [(move, self.executor.submit(_search_move, board, move, depth, maximizing, deadline))
+                       for move in moves[1:]]
+            for move, future in futures:
+                results.append((move, future.result()))
+
+        self.explored = sum(result[1] for move, result in results)
+        if any(result[0] is None for move, result in results):
+            raise SearchTimeout()
+
+        # ties go to the earlier (better ordered) move, like in minimax
+        best_eval, best_move = None, None
+        for move, (eval, _) in results:
+            if best_eval is None or (eval > best_eval if maximizing else eval < best_eval):
+                best_eval, best_move = eval, move
+        return best_eval, best_move, self.explored
+
+    def stop(self):
+        self.stop_flag.value = 1
+
+    def close(self):
+        self.stop()
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -4,10 +4,11 @@ piece.py
 Defines chess piece classes for Royal Gambit.
 """
 
-import os
-
 class Piece:
-    def __init__(self, name, color, value, texture=None, texture_rect=None):
+
+    __slots__ = ('name', 'color', 'value', 'moves', 'moved')
+
+    def __init__(self, name, color, value):
         self.name = name
         self.color = color
         # Adjust value sign based on color (white positive, black negative)
@@ -15,13 +16,6 @@ class Piece:
         self.value = value * value_sign
         self.moves = []  # List of valid moves
         self.moved = False  # Track if piece has been moved
-        self.texture = texture
-        self.set_texture()
-        self.texture_rect = texture_rect
-
-    def set_texture(self, size=80):
-        # Set the image path for the piece texture based on its name and color
-        self.texture = os.path.join(f'assets/images/imgs-{size}px/{self.color}_{self.name}.png')
 
     def add_move(self, move):
         self.moves.append(move)
@@ -31,28 +25,40 @@ class Piece:
 
 # Specific piece classes with personalized initialization
 class Pawn(Piece):
+    __slots__ = ('dir', 'en_passant')
+
     def __init__(self, color):
         self.dir = -1 if color == 'white' else 1  # Direction of movement based on color
         self.en_passant = False
         super().__init__('pawn', color, 1.0)
 
 class Knight(Piece):
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('knight', color, 3.0)
 
 class Bishop(Piece):
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('bishop', color, 3.001)
 
 class Rook(Piece):
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('rook', color, 5.0)
 
 class Queen(Piece):
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('queen', color, 9.0)
 
 class King(Piece):
+    __slots__ = ('left_rook', 'right_rook')
+
     def __init__(self, color):
         # Store references for castling later on
         self.left_rook = None
@@ -0,0 +1,68 @@
+"""
+pst.py
+----------
+Piece-square tables (heatmaps) for the Royal Gambit evaluation.
+Flat arrays of 64 values indexed by row * 8 + col, built once at import.
+"""
+
+from .bitboard import PIECE_NAMES
+
+# white pawns (rewarded for advancing, promotion on row 0)
+PAWN = [
+    9.00, 9.00, 9.00, 9.00, 9.00, 9.00, 9.00, 9.00,
+    0.10, 0.10, 0.10, 0.10, 0.10, 0.10, 0.10, 0.10,
+    0.07, 0.07, 0.08, 0.09, 0.09, 0.08, 0.07, 0.07,
+    0.03, 0.03, 0.05, 0.08, 0.08, 0.05, 0.03, 0.03,
+    0.02, 0.02, 0.04, 0.07, 0.07, 0.04, 0.02, 0.02,
+    0.01, 0.01, 0.03, 0.06, 0.06, 0.03, 0.01, 0.01,
+    0.02, 0.01, 0.00, 0.00, 0.00, 0.00, 0.01, 0.02,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+]
+
+# knights (centralization)
+KNIGHT = [
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.00, 0.01, 0.01, 0.01, 0.01, 0.01, 0.01, 0.00,
+    0.00, 0.02, 0.06, 0.05, 0.05, 0.06, 0.02, 0.00,
+    0.00, 0.03, 0.05, 0.10, 0.10, 0.05, 0.03, 0.00,
+    0.00, 0.03, 0.05, 0.10, 0.10, 0.05, 0.03, 0.00,
+    0.00, 0.02, 0.06, 0.05, 0.05, 0.06, 0.02, 0.00,
+    0.00, 0.01, 0.01, 0.01, 0.01, 0.01, 0.01, 0.00,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+]
+
+# bishops (long diagonals)
+BISHOP = [
+    0.02, 0.01, 0.01, 0.01, 0.01, 0.01, 0.01, 0.02,
+    0.01, 0.05, 0.03, 0.03, 0.03, 0.03, 0.05, 0.01,
+    0.01, 0.03, 0.07, 0.05, 0.05, 0.07, 0.03, 0.01,
+    0.01, 0.03, 0.05, 0.10, 0.10, 0.05, 0.03, 0.01,
+    0.01, 0.03, 0.05, 0.10, 0.10, 0.05, 0.03, 0.01,
+    0.01, 0.03, 0.07, 0.05, 0.05, 0.07, 0.03, 0.01,
+    0.01, 0.05, 0.03, 0.03, 0.03, 0.03, 0.05, 0.01,
+    0.02, 0.01, 0.01, 0.01, 0.01, 0.01, 0.01, 0.02,
+]
+
+# white king (castled corners)
+KING = [
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
+    0.02, 0.02, 0.00, 0.00, 0.00, 0.00, 0.02, 0.02,
+    0.05, 0.50, 0.10, 0.00, 0.00, 0.00, 0.10, 0.05,
+]
+
+def _mirror(table):
+    # the same table seen from black's side of the board
+    return [table[(7 - row) * 8 + col] for row in range(8) for col in range(8)]
+
+_WHITE = {'pawn': PAWN, 'knight': KNIGHT, 'bishop': BISHOP, 'king': KING}
+
+# PST[color][name][sq]: signed like the piece values (white +, black -)
+PST = {
+    'white': {name: list(_WHITE.get(name, [0.0] * 64)) for name in PIECE_NAMES},
+    'black': {name: [-value for value in _mirror(_WHITE.get(name, [0.0] * 64))] for name in PIECE_NAMES},
+}
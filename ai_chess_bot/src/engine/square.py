@@ -7,6 +7,8 @@ Defines the Square class for board representation in Royal Gambit.
 class Square:
     ALPHACOLS = {0: 'a', 1: 'b', 2: 'c', 3: 'd', 4: 'e', 5: 'f', 6: 'g', 7: 'h'}
 
+    __slots__ = ('row', 'col', 'piece', 'alphacol')
+
     def __init__(self, row, col, piece=None):
         self.row = row
         self.col = col
@@ -39,3 +41,6 @@ class Square:
     @staticmethod
     def get_alphacol(col):
         return Square.ALPHACOLS[col]
+
+# one shared square per index (row * 8 + col) for the moves: never given a piece
+SQUARES = tuple(Square(sq // 8, sq % 8) for sq in range(64))
@@ -0,0 +1,413 @@
+"""
+tablebase.py
+----------
+Endgame tablebases for Royal Gambit: the exact result of every position of a small
+endgame (KQK, KRK, KPK, KBNK, ...) with its distance to mate, built by retrograde
+analysis (see maketb.py) and probed by the AI through mmap.
+
+A table is named by its material, the stronger side first as white (e.g. 'KQK',
+'KBNK', 'KQKR'). Its file holds one byte per position: 0 for a draw (or an illegal
+position), else the distance to mate in plies + 1, from the side to move (odd
+distances are wins, even ones losses). Positions are indexed by the side to move,
+then the squares of the kings and the other pieces, reduced by symmetry: the white
+king is kept to the a8-d8-d5 triangle (10 squares), or to the a-d files when there
+are pawns. Tables with pawns of both sides (en passant) are not supported, and
+pawns only promote to a queen, like everywhere else in the engine.
+"""
+
+import mmap, os
+
+from .bitboard import (PIECE_NAMES, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS,
+                       bishop_attacks, rook_attacks, queen_attacks, bits)
+
+# tables shipped with the game (built by maketb.py)
+TB_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'tablebases'))
+# the AI probes positions with this many pieces or fewer (kings included)
+TB_PIECES = 4
+
+LETTERS = {'queen': 'Q', 'rook': 'R', 'bishop': 'B', 'knight': 'N', 'pawn': 'P'}
+NAMES = {letter: name for name, letter in LETTERS.items()}
+ORDER = 'QRBNP'
+VALUES = {'Q': 9, 'R': 5, 'B': 3, 'N': 3, 'P': 1}
+
+# -------
+# INDEXES
+# -------
+
+def _transform(sq, t):
+    # the 8 symmetries of the board: mirror the columns (t & 1), the rows (t & 2), then transpose (t & 4)
+    row, col = divmod(sq, 8)
+    if t & 1:
+        col = 7 - col
+    if t & 2:
+        row = 7 - row
+    if t & 4:
+        row, col = col, row
+    return row * 8 + col
+
+def _in_triangle(sq):
+    row, col = divmod(sq, 8)
+    return row <= col <= 3
+
+SYMMETRY = [[_transform(sq, t) for sq in range(64)] for t in range(8)]
+# white king squares of the index, and the symmetries that take a square to one of them
+TRIANGLE = [sq for sq in range(64) if _in_triangle(sq)]
+TRIANGLE_TRANSFORMS = [[t for t in range(8) if _in_triangle(SYMMETRY[t][sq])] for sq in range(64)]
+# with pawns, only the left-right mirror keeps the position the same
+FILES = [sq for sq in range(64) if sq % 8 <= 3]
+FILES_TRANSFORMS = [[t for t in (0, 1) if SYMMETRY[t][sq] % 8 <= 3] for sq in range(64)]
+
+def table_name(white, black):
+    '''
+        Table of the non-king pieces of each side (letters): (name, flipped), flipped
+        when black is the stronger side and the position must be seen with the colors
+        swapped
+    '''
+    white = ''.join(sorted(white, key=ORDER.index))
+    black = ''.join(sorted(black, key=ORDER.index))
+    strength = lambda side: (sum(VALUES[letter] for letter in side), side)
+    if strength(black) > strength(white):
+        return f'K{black}K{white}', True
+    return f'K{white}K{black}', False
+
+def insufficient(white, black):
+    # no mate can be forced: no pawn, rook or queen and at most one minor piece each
+    return all(len(side) <= 1 and side in ('', 'B', 'N') for side in (white, black))
+
+def subtables(name):
+    '''
+        Tables a table converts into by a capture or a promotion (without the draws
+        by insufficient material)
+    '''
+    table = Table(name)
+    white, black = table.white, table.black
+    names = []
+    for side, other, flip in [(white, black, False), (black, white, True)]:
+        for i, letter in enumerate(side):
+            changed = [side[:i] + side[i + 1:]]
+            if letter == 'P':
+                changed.append(side[:i] + 'Q' + side[i + 1:])
+            for new in changed:
+                pair = (other, new) if flip else (new, other)
+                if not insufficient(*pair):
+                    sub = table_name(*pair)[0]
+                    if sub not in names:
+                        names.append(sub)
+    return names
+
+class Table:
+
+    def __init__(self, name, data=None):
+        self.name = name
+        split = name.index('K', 1)
+        self.white, self.black = name[1:split], name[split + 1:]
+        if 'P' in self.white and 'P' in self.black:
+            raise ValueError(f'{name}: tables with pawns of both sides are not supported')
+        # pieces in index order: the kings, then the white and the black pieces
+        self.pieces = ([('white', 'king'), ('black', 'king')] +
+                       [('white', NAMES[letter]) for letter in self.white] +
+                       [('black', NAMES[letter]) for letter in self.black])
+        pawns = 'P' in name
+        self.kings = FILES if pawns else TRIANGLE
+        self.king_index = {sq: i for i, sq in enumerate(self.kings)}
+        self.transforms = FILES_TRANSFORMS if pawns else TRIANGLE_TRANSFORMS
+        # runs of identical pieces: their squares are sorted so that swapping them is the same position
+        self.runs = []
+        start = 2
+        for i in range(3, len(self.pieces) + 1):
+            if i == len(self.pieces) or self.pieces[i] != self.pieces[start]:
+                if i - start > 1:
+                    self.runs.append((start, i))
+                start = i
+        self.half = len(self.kings) * 64 ** (len(self.pieces) - 1) # positions with one side to move
+        self.size = 2 * self.half
+        self.data = data # a byte per position
+
+    def index(self, squares, black):
+        '''
+            Index of the position (squares in the order of self.pieces, black to move or not)
+        '''
+        best = None
+        for t in self.transforms[squares[0]]:
+            sym = SYMMETRY[t]
+            moved = [sym[sq] for sq in squares]
+            for start, end in self.runs:
+                moved[start:end] = sorted(moved[start:end])
+            index = self.king_index[moved[0]]
+            for sq in moved[1:]:
+                index = index * 64 + sq
+            if best is None or index < best:
+                best = index
+        return best + self.half if black else best
+
+    def position(self, index):
+        '''
+            Squares and side to move (black or not) of an index
+        '''
+        black = index >= self.half
+        index %= self.half
+        squares = []
+        for i in range(len(self.pieces) - 1):
+            index, sq = divmod(index, 64)
+            squares.append(sq)
+        squares.append(self.kings[index])
+        squares.reverse()
+        return squares, black
+
+    def result(self, index):
+        '''
+            (wdl, plies) from the side to move: wdl is 1 for a win, -1 for a loss and
+            0 for a draw, plies the distance to mate
+        '''
+        value = self.data[index]
+        if not value:
+            return 0, 0
+        return (1 if value % 2 == 0 else -1), value - 1
+
+class Tablebase:
+
+    def __init__(self, path=TB_PATH):
+        self.tables = {} # name -> Table, its file is mapped on the first probe
+        self.files = {}
+        if path is not None and os.path.isdir(path):
+            for file in os.listdir(path):
+                name, ext = os.path.splitext(file)
+                if ext == '.tb':
+                    self.files[name] = os.path.join(path, file)
+
+    def add(self, table):
+        self.tables[table.name] = table
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None and name in self.files:
+            with open(self.files[name], 'rb') as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            table = self.tables[name] = Table(name, data)
+        return table
+
+    def probe_pieces(self, pieces, squares, black):
+        '''
+            Result of a position given as (color, name) pieces, their squares and the
+            side to move: (wdl, plies) as in Table.result, or None without a table
+        '''
+        sides = {'white': [], 'black': []}
+        for color, name in pieces:
+            if name != 'king':
+                sides[color].append(LETTERS[name])
+        white, black_side = ''.join(sides['white']), ''.join(sides['black'])
+        if insufficient(white, black_side):
+            return 0, 0
+        name, flipped = table_name(white, black_side)
+        table = self.table(name)
+        if table is None:
+            return None
+
+        # squares in the order of the table's pieces (flipped: colors swapped, board mirrored)
+        found = {}
+        for (color, name), sq in zip(pieces, squares):
+            if flipped:
+                color, sq = ('black' if color == 'white' else 'white'), sq ^ 56
+            found.setdefault((color, name), []).append(sq)
+        squares = [found[piece].pop() for piece in table.pieces]
+        return table.result(table.index(squares, black != flipped))
+
+    def probe(self, board):
+        pieces, squares = [], []
+        for color in ('white', 'black'):
+            for name in PIECE_NAMES:
+                for sq in bits(board.bitboards[color][name]):
+                    pieces.append((color, name))
+                    squares.append(sq)
+        return self.probe_pieces(pieces, squares, board.next_player == 'black')
+
+# ----------
+# GENERATION
+# ----------
+
+def _attacks(name, color, sq, occupied):
+    if name == 'king':
+        return KING_ATTACKS[sq]
+    if name == 'knight':
+        return KNIGHT_ATTACKS[sq]
+    if name == 'bishop':
+        return bishop_attacks(sq, occupied)
+    if name == 'rook':
+        return rook_attacks(sq, occupied)
+    if name == 'queen':
+        return queen_attacks(sq, occupied)
+    return PAWN_ATTACKS[color][sq]
+
+def _attacked(pieces, squares, target, color, occupied):
+    # is the square attacked by a piece of the color ? (captured pieces have no square)
+    for (piece_color, name), sq in zip(pieces, squares):
+        if piece_color == color and sq is not None and _attacks(name, color, sq, occupied) >> target & 1:
+            return True
+    return False
+
+def _occupied(pieces, squares, color):
+    return sum(1 << sq for (piece_color, name), sq in zip(pieces, squares) if piece_color == color)
+
+def _legal(pieces, squares, black):
+    # one piece per square, no pawn on the first or last row and the side not to move not in check
+    if len(set(squares)) != len(squares):
+        return False
+    for (color, name), sq in zip(pieces, squares):
+        if name == 'pawn' and sq // 8 in (0, 7):
+            return False
+    king = squares[0] if black else squares[1]
+    return not _attacked(pieces, squares, king, 'black' if black else 'white', sum(1 << sq for sq in squares))
+
+def _moves(pieces, squares, black):
+    '''
+        Legal moves of the side to move: [(squares after the move, moved piece index,
+        captured piece index or None, promotion or not)]
+    '''
+    color, other = ('black', 'white') if black else ('white', 'black')
+    own = _occupied(pieces, squares, color)
+    enemy = _occupied(pieces, squares, other)
+    occupied = own | enemy
+    king = squares[1] if black else squares[0]
+    moves = []
+    for i, ((piece_color, name), sq) in enumerate(zip(pieces, squares)):
+        if piece_color != color:
+            continue
+        if name == 'pawn':
+            step = 8 if black else -8
+            targets = PAWN_ATTACKS[color][sq] & enemy
+            if not occupied >> (sq + step) & 1:
+                targets |= 1 << (sq + step)
+                if sq // 8 == (1 if black else 6) and not occupied >> (sq + 2 * step) & 1:
+                    targets |= 1 << (sq + 2 * step)
+        else:
+            targets = _attacks(name, color, sq, occupied) & ~own
+        for target in bits(targets):
+            new = list(squares)
+            new[i] = target
+            captured = None
+            if enemy >> target & 1:
+                captured = squares.index(target)
+                new[captured] = None
+            after = occupied & ~(1 << sq) | 1 << target
+            if not _attacked(pieces, new, target if name == 'king' else king, other, after):
+                moves.append((new, i, captured, name == 'pawn' and target // 8 in (0, 7)))
+    return moves
+
+def _parents(table, squares, black):
+    '''
+        Indexes of the positions a quiet move (no capture or promotion) of the other
+        side leads from to this one
+    '''
+    pieces = table.pieces
+    mover = 'white' if black else 'black'
+    king = squares[1] if black else squares[0] # king of the side to move here, not to move before
+    occupied = sum(1 << sq for sq in squares)
+    parents = set()
+    for i, ((color, name), sq) in enumerate(zip(pieces, squares)):
+        if color != mover:
+            continue
+        if name == 'pawn':
+            step = 8 if mover == 'white' else -8
+            origins = 0
+            if 1 <= (sq + step) // 8 <= 6 and not occupied >> (sq + step) & 1:
+                origins |= 1 << (sq + step)
+                if sq // 8 == (4 if mover == 'white' else 3) and not occupied >> (sq + 2 * step) & 1:
+                    origins |= 1 << (sq + 2 * step)
+        else:
+            origins = _attacks(name, color, sq, occupied) & ~occupied
+        for origin in bits(origins):
+            new = list(squares)
+            new[i] = origin
+            before = occupied & ~(1 << sq) | 1 << origin
+            if not _attacked(pieces, new, king, mover, before):
+                parents.add(table.index(new, not black))
+    return parents
+
+def generate(name, tablebase, report=None):
+    '''
+        Build the table of an endgame by retrograde analysis: the mates first, then
+        the positions one ply further from mate at every pass. The tables it converts
+        into (see subtables) must be in the tablebase. report(plies, count) is called
+        after every pass.
+    '''
+    table = Table(name)
+    pieces = table.pieces
+    values = bytearray(table.size)
+    counts = bytearray(table.size) # children not known to be lost for the side to move
+    levels = {0: []} # distance to mate -> positions found at it
+    wins, drops = {}, {} # plies -> positions with a child in another table lost / won at that distance
+
+    for index in range(table.size):
+        squares, black = table.position(index)
+        if (len(table.transforms[squares[0]]) > 1 or table.runs) and table.index(squares, black) != index:
+            continue # another index of the same position
+        if not _legal(pieces, squares, black):
+            continue
+        moves = _moves(pieces, squares, black)
+        if not moves:
+            king = squares[1] if black else squares[0]
+            if _attacked(pieces, squares, king, 'white' if black else 'black', sum(1 << sq for sq in squares)):
+                values[index] = 1 # mated
+                levels[0].append(index)
+            continue # (stalemate: draw)
+
+        children = set()
+        outside = 0
+        for new, moved, captured, promotion in moves:
+            if captured is None and not promotion:
+                children.add(table.index(new, not black))
+                continue
+            # converts into another table
+            child = list(pieces)
+            if promotion:
+                child[moved] = (child[moved][0], 'queen')
+            child = [piece for piece, sq in zip(child, new) if sq is not None]
+            result = tablebase.probe_pieces(child, [sq for sq in new if sq is not None], not black)
+            if result is None:
+                raise ValueError(f'{name} needs the tables {", ".join(subtables(name))}')
+            wdl, plies = result
+            outside += 1
+            if wdl < 0:
+                wins.setdefault(plies, []).append(index)
+            elif wdl > 0:
+                drops.setdefault(plies, []).append(index)
+        counts[index] = len(children) + outside
+
+    plies = 0
+    while levels.get(plies) or wins or drops:
+        found = levels.setdefault(plies + 1, [])
+        value = plies + 2 # (distance + 1 of the positions found now)
+        if value > 255:
+            raise ValueError(f'{name}: mates longer than 254 plies')
+        for index in wins.pop(plies, ()):
+            if not values[index]:
+                values[index] = value
+                found.append(index)
+        for index in drops.pop(plies, ()):
+            counts[index] -= 1
+            if not counts[index] and not values[index]:
+                values[index] = value
+                found.append(index)
+        lost = plies % 2 == 0 # for the side to move of this level
+        for index in levels.pop(plies, ()):
+            squares, black = table.position(index)
+            for parent in _parents(table, squares, black):
+                if values[parent]:
+                    continue
+                if not lost:
+                    counts[parent] -= 1
+                    if counts[parent]:
+                        continue
+                values[parent] = value
+                found.append(parent)
+        if report is not None:
+            report(plies + 1, len(found))
+        plies += 1
+
+    table.data = values
+    return table
+
+def write(path, table):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(table.data)
@@ -0,0 +1,56 @@
+"""
+tt.py
+----------
+Fixed-size transposition table for the Royal Gambit AI.
+"""
+
+import struct
+
+# bound types
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+class TranspositionTable:
+
+    # key, score, move, depth, bound, age
+    ENTRY = struct.Struct('<QdHbBB')
+
+    def __init__(self, size_mb=16):
+        self.size = max(1, size_mb * 1024 * 1024 // self.ENTRY.size)
+        self.table = bytearray(self.size * self.ENTRY.size)
+        self.age = 0
+
+    def new_search(self):
+        # entries from previous searches can always be replaced
+        self.age = (self.age + 1) % 256
+
+    def clear(self):
+        self.table = bytearray(self.size * self.ENTRY.size)
+        self.age = 0
+
+    def probe(self, key):
+        '''
+            Return (depth, bound, score, move) stored for the key, or None
+        '''
+        offset = (key % self.size) * self.ENTRY.size
+        entry_key, score, move, depth, bound, age = self.ENTRY.unpack_from(self.table, offset)
+        if entry_key != key:
+            return None
+        return depth, bound, score, move
+
+    def store(self, key, depth, bound, score, move):
+        '''
+            Depth-preferred replacement: keep the deeper entry unless it is stale
+        '''
+        offset = (key % self.size) * self.ENTRY.size
+        entry_key, _, entry_move, entry_depth, _, entry_age = self.ENTRY.unpack_from(self.table, offset)
+        if entry_key == key:
+            if depth < entry_depth:
+                return
+            # keep the known best move when this search found none
+            if not move:
+                move = entry_move
+        elif entry_key and entry_age == self.age and depth < entry_depth:
+            return
+        self.ENTRY.pack_into(self.table, offset, key, score, move, depth, bound, self.age)
@@ -0,0 +1,38 @@
+"""
+undo.py
+----------
+Undo record used by Board.make_move / Board.unmake_move.
+"""
+
+class Undo:
+
+    __slots__ = ('piece', 'move', 'moved', 'en_passant', 'en_passant_col', 'last_move',
+                 'castling_state', 'hash', 'attack_maps', 'material', 'positional',
+                 'captured', 'captured_row', 'captured_col', 'promotion',
+                 'rook', 'rook_moved', 'rook_initial_col', 'rook_final_col')
+
+    def __init__(self, piece, move, moved, en_passant, last_move):
+        # moved piece and the move that was made as a packed int (None for a null move)
+        self.piece = piece
+        self.move = move
+        # state of the board before the move
+        self.moved = moved
+        self.en_passant = en_passant
+        self.en_passant_col = None
+        self.last_move = last_move # packed int
+        self.castling_state = 0
+        self.hash = 0
+        self.attack_maps = None
+        self.material = 0
+        self.positional = 0
+        # captured piece and the square it was captured on
+        self.captured = None
+        self.captured_row = None
+        self.captured_col = None
+        # pawn promotion (the new queen)
+        self.promotion = None
+        # castling rook movement
+        self.rook = None
+        self.rook_moved = False
+        self.rook_initial_col = None
+        self.rook_final_col = None
@@ -0,0 +1,52 @@
+"""
+worker.py
+----------
+Runs the AI search on a background thread so the game loop keeps running.
+"""
+
+import copy, threading, time
+
+class AIWorker:
+
+    def __init__(self, ai, min_time=0.5):
+        self.ai = ai
+        self.min_time = min_time # seconds before the move is played (so the user sees their own move)
+        self.thread = None
+        self.move = None
+        self.start_time = 0
+
+    def start(self, board):
+        # search on a copy of the position, the game keeps the real board
+        board = copy.deepcopy(board)
+        self.move = None
+        self.start_time = time.time()
+        self.ai.stopped = False
+        self.thread = threading.Thread(target=self._search, args=(board,), daemon=True)
+        self.thread.start()
+
+    def _search(self, board):
+        self.move = self.ai.eval(board)
+
+    def searching(self):
+        return self.thread is not None
+
+    def result(self):
+        '''
+            The best move once the search has finished (None while searching)
+        '''
+        if self.thread is None or self.thread.is_alive():
+            return None
+        if time.time() - self.start_time < self.min_time:
+            return None
+        move = self.move
+        self.thread = None
+        self.move = None
+        return move
+
+    def cancel(self):
+        # stop the search and drop its move
+        if self.thread is not None:
+            self.ai.stop()
+            self.thread.join()
+        self.thread = None
+        self.move = None
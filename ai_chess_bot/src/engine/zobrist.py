@@ -0,0 +1,28 @@
+"""
+zobrist.py
+----------
+Zobrist hashing keys for Royal Gambit positions.
+The keys are drawn from a fixed seed so a position always hashes to the same
+value, across runs and processes.
+"""
+
+import random
+
+from .bitboard import PIECE_NAMES
+
+_random = random.Random(20240229)
+
+def _key():
+    return _random.getrandbits(64)
+
+# PIECE_KEYS[color][name][sq]
+PIECE_KEYS = {
+    color: {name: [_key() for sq in range(64)] for name in PIECE_NAMES}
+    for color in ('white', 'black')
+}
+# xored in when black is to move
+SIDE_KEY = _key()
+# one key per castling rights combination (4 bits, see Board.castling_rights)
+CASTLING_KEYS = [_key() for rights in range(16)]
+# one key per file of the pawn that can be captured en passant
+EN_PASSANT_KEYS = [_key() for col in range(8)]
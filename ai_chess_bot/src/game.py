@@ -6,27 +6,111 @@ Core game loop and rendering for Royal Gambit.
 
 import pygame
 
-from ai import AI
 from const import *
-from board import Board
 from dragger import Dragger
 from config import Config
-from square import Square
+from sprites import Sprites
+from engine import AI, AIWorker, Board, Move, Square
+
+LOG_AREA = pygame.Rect(WIDTH, 0, LOG_WIDTH, HEIGHT)
+LOG_PADDING = 5
+LOG_SPACING = 2 # between lines
 
 class Game:
     def __init__(self):
         self.board = Board()
         self.ai = AI()
-        self.next_player = 'white'
-        self.hovered_sqr = None
+        self.ai_worker = AIWorker(self.ai)
         self.dragger = Dragger()
         self.config = Config()
+        self.background = None  # board of the current theme, drawn once
+        self.move_dot = None
+        self._new_game()
+
+    def _new_game(self):
+        # state of one game (reset keeps the board, AI, config and caches)
+        self.next_player = 'white'
+        self.hovered_sqr = None
         self.move_log = []      # list of moves made during the game
+        self.log_lines = []     # rendered move log lines, one per move pair
+        self.log_rendered = 0   # moves already in log_lines
+        self.log_scroll = 0     # first visible line
+        self.log_follow = True  # keep the last line in view
+        self.status = 'ongoing' # board status after the last move (see Board.status)
         self.game_over = False  # flag for game over
+        self.result = None      # endgame text
+        self.dirty = []         # screen rects to redraw this frame
+        self.mark_all()
+
+    # ---------
+    # RENDERING
+    # ---------
+
+    def render(self, surface):
+        '''
+            Redraw the dirty parts of the window, returns the rects to update on the display
+        '''
+        if not self.dirty:
+            return []
+        dirty = self.dirty
+        self.dirty = []
+        clip = dirty[0].unionall(dirty[1:])
+        surface.set_clip(clip)
+        self.show_bg(surface)
+        self.show_last_move(surface)
+        self.show_moves(surface)
+        self.show_pieces(surface)
+        self.show_hover(surface)
+        if self.dragger.dragging:
+            self.dragger.update_blit(surface)
+        if clip.colliderect(LOG_AREA):
+            self.draw_move_log(surface)
+        if self.game_over:
+            self.draw_endgame_text(surface, self.result)
+        surface.set_clip(None)
+        return dirty
+
+    def mark_all(self):
+        self.dirty = [pygame.Rect(0, 0, WIDTH + LOG_WIDTH, HEIGHT)]
+
+    def mark_rect(self, rect):
+        self.dirty.append(rect)
+
+    def mark_square(self, row, col):
+        self.mark_rect(pygame.Rect(col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE))
+
+    def mark_move(self, undo):
+        # squares changed by a move, the trace of the move before it and the move log
+        for code in (undo.move, undo.last_move):
+            if code is not None:
+                move = Move.decode(code)
+                self.mark_square(move.initial.row, move.initial.col)
+                self.mark_square(move.final.row, move.final.col)
+        if undo.captured is not None:
+            self.mark_square(undo.captured_row, undo.captured_col)
+        if undo.rook is not None:
+            row = Move.decode(undo.move).final.row
+            self.mark_square(row, undo.rook_initial_col)
+            self.mark_square(row, undo.rook_final_col)
+        self.mark_rect(LOG_AREA)
+
+    def mark_drag(self):
+        # the dragged piece, the square it left and the dots of its moves
+        dragger = self.dragger
+        self.mark_square(dragger.initial_row, dragger.initial_col)
+        for move in dragger.piece.moves:
+            self.mark_square(move.final.row, move.final.col)
+        self.mark_rect(dragger.rect())
 
     def show_bg(self, surface):
+        if self.background is None:
+            self.background = self.render_bg()
+        surface.blit(self.background, (0, 0))
+
+    def render_bg(self):
         theme = self.config.theme
-        
+        surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+
         for row in range(ROWS):
             for col in range(COLS):
                 # color
@@ -48,6 +132,7 @@ class Game:
                     lbl = self.config.font.render(Square.get_alphacol(col), 1, color)
                     lbl_pos = (col * SQSIZE + SQSIZE - 20, HEIGHT - 20)
                     surface.blit(lbl, lbl_pos)
+        return surface
 
     def show_pieces(self, surface):
         for row in range(ROWS):
@@ -55,21 +140,20 @@ class Game:
                 if self.board.squares[row][col].has_piece():
                     piece = self.board.squares[row][col].piece
                     if piece is not self.dragger.piece:
-                        piece.set_texture(size=80)
-                        img = pygame.image.load(piece.texture)
+                        img = Sprites.get(piece)
                         img_center = (col * SQSIZE + SQSIZE // 2, row * SQSIZE + SQSIZE // 2)
-                        piece.texture_rect = img.get_rect(center=img_center)
-                        surface.blit(img, piece.texture_rect)
+                        surface.blit(img, img.get_rect(center=img_center))
 
     def show_moves(self, surface):
         if self.dragger.dragging:
             piece = self.dragger.piece
+            radius = SQSIZE // 7
+            if self.move_dot is None:
+                self.move_dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(self.move_dot, (211, 211, 211, 150), (radius, radius), radius)
             for move in piece.moves:
                 center = (move.final.col * SQSIZE + SQSIZE // 2, move.final.row * SQSIZE + SQSIZE // 2)
-                radius = SQSIZE // 7
-                circle_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(circle_surface, (211, 211, 211, 150), (radius, radius), radius)
-                surface.blit(circle_surface, (center[0] - radius, center[1] - radius))
+                surface.blit(self.move_dot, (center[0] - radius, center[1] - radius))
 
     def show_last_move(self, surface):
         theme = self.config.theme
@@ -89,23 +173,55 @@ class Game:
             rect = (self.hovered_sqr.col * SQSIZE, self.hovered_sqr.row * SQSIZE, SQSIZE, SQSIZE)
             pygame.draw.rect(surface, color, rect, width=3)
 
+    def ai_turn(self):
+        return self.ai_enabled and self.next_player == self.ai.color and not self.game_over
+
     def next_turn(self):
         self.next_player = 'white' if self.next_player == 'black' else 'black'
 
     def set_hover(self, row, col):
-        self.hovered_sqr = self.board.squares[row][col]
+        # (no hover outside the board, over the move log)
+        hovered = self.board.squares[row][col] if col < COLS else None
+        if hovered is not self.hovered_sqr:
+            for square in (self.hovered_sqr, hovered):
+                if square is not None:
+                    self.mark_square(square.row, square.col)
+            self.hovered_sqr = hovered
 
     def change_theme(self):
         self.config.change_theme()
+        self.background = None
+        self.mark_all()
+
+    # Bookkeeping after a move of either side: redraw, log, turn, status and sound.
+    def played(self, move, undo):
+        self.mark_move(undo)
+        self.move_log.append(move)
+        self.next_turn()
+        self.update_status()
+        self.play_sound(self.board.move_events(undo))
 
-    def play_sound(self, captured=False):
-        if captured:
+    # Play the sound of a move from its board events (see Board.move_events).
+    def play_sound(self, events=()):
+        if self.status == 'checkmate':
+            self.config.checkmate_sound.play()
+        elif 'check' in events:
+            self.config.check_sound.play()
+        elif 'promote' in events:
+            self.config.promote_sound.play()
+        elif 'castle' in events:
+            self.config.castle_sound.play()
+        elif 'capture' in events:
             self.config.capture_sound.play()
         else:
             self.config.move_sound.play()
     
     def reset(self):
-        self.__init__()
+        self.ai_worker.cancel()
+        self.dragger.undrag_piece()
+        self.board.reset()
+        self.ai.new_game()
+        self._new_game()
 
     # Updated helper: converts a move to algebraic notation with a space between the starting square and ending square.
     def move_to_notation(self, move):
@@ -116,32 +232,53 @@ class Game:
         # Return notation with a space between the squares (e.g., "e2 e4")
         return initial_file + initial_rank + " " + final_file + final_rank
 
-    # Modified move log drawing method using chess notation.
-    def draw_move_log(self, surface):
-        move_log_panel_width = 210
-        move_log_panel_height = HEIGHT
-        move_log_area = pygame.Rect(WIDTH, 0, move_log_panel_width, move_log_panel_height)
-        pygame.draw.rect(surface, (45, 45, 46), move_log_area)
-        move_texts = []
-        for i in range(0, len(self.move_log), 2):
+    # Render the move log lines of the new moves only (a line is redone when black's move completes it).
+    def update_move_log(self):
+        font = self.config.log_font
+        for i in range(self.log_rendered - self.log_rendered % 2, len(self.move_log), 2):
             move_string = f'{i // 2 + 1}. {self.move_to_notation(self.move_log[i])}'
             if i + 1 < len(self.move_log):
                 # Insert a space between white and black moves
                 move_string += f' {self.move_to_notation(self.move_log[i + 1])}'
-            move_texts.append(move_string)
-        padding = 5
-        line_spacing = 2
-        text_y = padding
-        font = pygame.font.SysFont('Arial', 14)
-        for text in move_texts:
-            text_object = font.render(text, True, (245, 245, 245))
-            text_location = move_log_area.move(padding, text_y)
-            surface.blit(text_object, text_location)
-            text_y += text_object.get_height() + line_spacing
+            line = font.render(move_string, True, (245, 245, 245))
+            if i // 2 < len(self.log_lines):
+                self.log_lines[i // 2] = line
+            else:
+                self.log_lines.append(line)
+        self.log_rendered = len(self.move_log)
+        if self.log_follow:
+            self.log_scroll = self.max_log_scroll()
+
+    def log_line_height(self):
+        return self.config.log_font.get_height() + LOG_SPACING
+
+    def max_log_scroll(self):
+        visible = (HEIGHT - LOG_PADDING) // self.log_line_height()
+        return max(len(self.log_lines) - visible, 0)
+
+    # Scroll the move log by a number of lines (negative is up).
+    def scroll_log(self, lines):
+        self.update_move_log()
+        self.log_scroll = min(max(self.log_scroll + lines, 0), self.max_log_scroll())
+        self.log_follow = self.log_scroll == self.max_log_scroll()
+        self.mark_rect(LOG_AREA)
+
+    # Draw the visible lines of the move log.
+    def draw_move_log(self, surface):
+        if self.log_rendered != len(self.move_log):
+            self.update_move_log()
+        pygame.draw.rect(surface, (45, 45, 46), LOG_AREA)
+        text_y = LOG_PADDING
+        height = self.log_line_height()
+        for line in self.log_lines[self.log_scroll:]:
+            if text_y >= HEIGHT:
+                break
+            surface.blit(line, LOG_AREA.move(LOG_PADDING, text_y))
+            text_y += height
 
     # Draw endgame text with a shadow effect.
     def draw_endgame_text(self, surface, text):
-        font = pygame.font.SysFont('Helvetica', 32, True, False)
+        font = self.config.endgame_font
         text_object = font.render(text, True, (128, 128, 128), (245, 255, 250))
         text_location = pygame.Rect(0, 0, WIDTH, HEIGHT).move(
             WIDTH / 2 - text_object.get_width() / 2,
@@ -151,12 +288,17 @@ class Game:
         shadow = font.render(text, True, (0, 0, 0))
         surface.blit(shadow, text_location.move(2, 2))
 
-    # Check for game over (using board's checkmate condition) and display message.
-    def check_game_over(self, surface):
-        if self.board.is_checkmate(self.next_player):
+    # Work out the game status once per move; the endgame message is drawn by render.
+    def update_status(self):
+        self.status = self.board.status()
+        if self.status == 'checkmate':
+            self.game_over = True
+            self.result = 'Black wins by checkmate' if self.next_player == 'white' else 'White wins by checkmate'
+        elif self.status == 'stalemate':
             self.game_over = True
-            text = 'Black wins by checkmate' if self.next_player == 'white' else 'White wins by checkmate'
-            self.draw_endgame_text(surface, text)
+            self.result = 'Draw by stalemate'
+        if self.game_over:
+            self.mark_all()
 
     def __str__(self):
         return "Game()"
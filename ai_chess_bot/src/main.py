@@ -8,10 +8,9 @@ import sys
 
 from const import *
 from game import Game
-from square import Square
-from move import Move
-from piece import King
+from engine import Move, Square
 from menu import StartMenu  # Import the StartMenu class
+from sprites import Sprites
 
 class Main:
     
@@ -21,6 +20,7 @@ class Main:
         self.current_mode = 'menu'  # either 'menu' or 'game'
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption('Royal Gambit')
+        Sprites.load()
         self.game = Game()
         self.menu = StartMenu(self.screen)  # Initialize the start menu
 
@@ -28,7 +28,8 @@ class Main:
         if mode == 'menu':
             self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         elif mode == 'game':
-            self.screen = pygame.display.set_mode((WIDTH + 210, HEIGHT))
+            self.screen = pygame.display.set_mode((WIDTH + LOG_WIDTH, HEIGHT))
+            self.game.mark_all()
         self.current_mode = mode
 
     def mainloop(self):
@@ -75,100 +76,88 @@ class Main:
                 board = self.game.board
                 dragger = self.game.dragger
 
-                game.show_bg(screen)
-                game.show_last_move(screen)
-                game.show_moves(screen)
-                game.show_pieces(screen)
-                game.show_hover(screen)
-
-                if dragger.dragging:
-                    dragger.update_blit(screen)
-
-                if game.ai_enabled and game.next_player == game.ai.color and not game.game_over:
-                    pygame.display.update()
-                    pygame.time.wait(500)
-                    best_move = game.ai.eval(game.board)
+                if game.ai_turn():
+                    # search in the background, poll for the move every frame
+                    if not game.ai_worker.searching():
+                        game.ai_worker.start(board)
+                    best_move = game.ai_worker.result()
                     if best_move:
                         piece = board.squares[best_move.initial.row][best_move.initial.col].piece
-                        board.move(piece, best_move)
-                        game.move_log.append(best_move)
-                        game.next_turn()
-                        game.play_sound(captured=board.squares[best_move.final.row][best_move.final.col].has_piece())
+                        undo = board.move(piece, best_move)
+                        game.played(best_move, undo)
 
                 for event in pygame.event.get():
                     if event.type == pygame.MOUSEBUTTONDOWN:
+                        # (wheel turns come as buttons 4 and 5; clicks on the move log miss the board)
+                        if event.button in (4, 5) or event.pos[0] >= WIDTH:
+                            continue
                         dragger.update_mouse(event.pos)
                         clicked_row = dragger.mouseY // SQSIZE
                         clicked_col = dragger.mouseX // SQSIZE
 
                         if board.squares[clicked_row][clicked_col].has_piece():
                             piece = board.squares[clicked_row][clicked_col].piece
-                            if piece.color == game.next_player:
+                            if piece.color == game.next_player and not game.ai_turn():
                                 board.calc_moves(piece, clicked_row, clicked_col, bool=True)
                                 dragger.save_initial(event.pos)
                                 dragger.drag_piece(piece)
-                                game.show_bg(screen)
-                                game.show_last_move(screen)
-                                game.show_moves(screen)
-                                game.show_pieces(screen)
+                                game.mark_drag()
 
                     elif event.type == pygame.MOUSEMOTION:
                         motion_row = event.pos[1] // SQSIZE
                         motion_col = event.pos[0] // SQSIZE
                         game.set_hover(motion_row, motion_col)
                         if dragger.dragging:
+                            game.mark_rect(dragger.rect())
                             dragger.update_mouse(event.pos)
-                            game.show_bg(screen)
-                            game.show_last_move(screen)
-                            game.show_moves(screen)
-                            game.show_pieces(screen)
-                            game.show_hover(screen)
-                            dragger.update_blit(screen)
+                            game.mark_rect(dragger.rect())
 
                     elif event.type == pygame.MOUSEBUTTONUP:
+                        if event.button in (4, 5):
+                            continue
                         if dragger.dragging:
+                            game.mark_drag()
                             dragger.update_mouse(event.pos)
                             released_row = dragger.mouseY // SQSIZE
                             released_col = dragger.mouseX // SQSIZE
 
-                            initial = Square(dragger.initial_row, dragger.initial_col)
-                            final = Square(released_row, released_col)
-                            move = Move(initial, final)
-
-                            if board.valid_move(dragger.piece, move):
-                                if isinstance(dragger.piece, King) and abs(dragger.initial_col - released_col) == 2:
-                                    board.move(dragger.piece, move)
-                                    game.config.castle_sound.play()
-                                else:
-                                    captured = board.squares[released_row][released_col].has_piece()
-                                    board.move(dragger.piece, move)
-                                    board.set_true_en_passant(dragger.piece)
-                                    game.play_sound(captured)
-                                game.move_log.append(move)
-                                game.next_turn()
-                                game.show_bg(screen)
-                                game.show_last_move(screen)
-                                game.show_pieces(screen)
+                            # (dropped on the move log: no move)
+                            if event.pos[0] < WIDTH:
+                                initial = Square(dragger.initial_row, dragger.initial_col)
+                                final = Square(released_row, released_col)
+                                move = Move(initial, final)
+
+                                if board.valid_move(dragger.piece, move):
+                                    undo = board.move(dragger.piece, move)
+                                    game.played(move, undo)
                         dragger.undrag_piece()
 
+                    elif event.type == pygame.MOUSEWHEEL:
+                        if pygame.mouse.get_pos()[0] >= WIDTH:
+                            game.scroll_log(-event.y)
+
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_r:
                             self.game.reset()
                         elif event.key == pygame.K_ESCAPE:
+                            self.game.ai_worker.cancel()
                             self.menu.menu_active = True
                             self.switch_mode('menu')
                         elif event.key == pygame.K_t:
                             self.game.change_theme()
+
+                    # window uncovered or restored: its contents are gone, redraw it all
+                    elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                        game.mark_all()
+
                     elif event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
 
-                # Draw the move log and game over text only in game mode.
-                game.draw_move_log(screen)
-                game.check_game_over(screen)
-
-                pygame.display.update()
+                # redraw and push only the parts of the window that changed
+                pygame.display.update(game.render(screen))
             clock.tick(60)
 
-main = Main()
-main.mainloop()
+if __name__ == '__main__':
+    main = Main()
+    main.mainloop()
@@ -0,0 +1,22 @@
+"""
+makebook.py
+----------
+Converts the opening tree of book.py into the binary book read by the AI.
+Run from the ai_chess_bot folder, e.g.:
+    python src/makebook.py
+    python src/makebook.py --output assets/books/book.bin
+"""
+
+import argparse
+
+from engine import Book
+from engine.binary_book import BinaryBook, BOOK_PATH
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Royal Gambit book converter')
+    parser.add_argument('--output', default=BOOK_PATH)
+    args = parser.parse_args()
+
+    entries = Book().entries()
+    count = BinaryBook.write(args.output, entries)
+    print(f'{count} moves written to {args.output}')
@@ -0,0 +1,38 @@
+"""
+maketb.py
+----------
+Builds the endgame tablebases probed by the AI (see engine/tablebase.py), with the
+tables they convert into first. Tables already in the output folder are kept.
+Run from the ai_chess_bot folder, e.g.:
+    python src/maketb.py
+    python src/maketb.py KQK KRK --output assets/tablebases
+"""
+
+import argparse, os, time
+
+from engine.tablebase import Tablebase, TB_PATH, generate, subtables, write
+
+TABLES = ['KQK', 'KRK', 'KPK', 'KBNK']
+
+def build(name, tablebase, output):
+    if tablebase.table(name) is not None:
+        return
+    for sub in subtables(name):
+        build(sub, tablebase, output)
+    start = time.time()
+    table = generate(name, tablebase)
+    path = os.path.join(output, f'{name}.tb')
+    write(path, table)
+    tablebase.add(table)
+    mates = max(table.data) - 1
+    print(f'{name}: {table.size} positions, longest mate {mates} plies, {time.time() - start:.1f}s -> {path}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Royal Gambit tablebase generator')
+    parser.add_argument('tables', nargs='*', default=TABLES)
+    parser.add_argument('--output', default=TB_PATH)
+    args = parser.parse_args()
+
+    tablebase = Tablebase(args.output)
+    for name in args.tables:
+        build(name, tablebase, args.output)
@@ -5,7 +5,7 @@ Main menu and UI components for Royal Gambit.
 """
 import pygame
 from const import WIDTH, HEIGHT
-from utils import load_gif_frames
+from utils import GifFrames
 import sys
 
 def render_text_with_outline(text, font, text_color, outline_color, outline_width):
@@ -34,9 +34,8 @@ class StartMenu:
         self.hovered_option = None
         self.menu_options = ['Start Game', 'Play vs AI', 'Controls', 'Exit']
         
-        # Load animated background frames from a GIF
-        self.bg_frames = load_gif_frames('assets/images/bg.gif')
-        self.current_frame = 0
+        # Animated background frames from a GIF, decoded in the background
+        self.bg_frames = GifFrames('assets/images/bg.gif', (WIDTH, HEIGHT))
         self.frame_delay = 100  # milliseconds delay between frames
         self.last_frame_update = pygame.time.get_ticks()
         
@@ -70,12 +69,12 @@ class StartMenu:
         
         now = pygame.time.get_ticks()
         if now - self.last_frame_update > self.frame_delay:
-            self.current_frame = (self.current_frame + 1) % len(self.bg_frames)
+            self.bg_frames.next()
             self.last_frame_update = now
 
     def draw_menu(self):
         self.update()
-        bg = self.bg_frames[self.current_frame]
+        bg = self.bg_frames.frame
         menu_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         menu_surface.blit(bg, (0, 0))
         
@@ -133,7 +132,7 @@ class StartMenu:
         selected_difficulty = None
         while selected_difficulty is None:
             self.update()
-            bg = self.bg_frames[self.current_frame]
+            bg = self.bg_frames.frame
             menu_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
             menu_surface.blit(bg, (0, 0))
             
@@ -0,0 +1,114 @@
+"""
+perft.py
+----------
+Move generation benchmark and verification for Royal Gambit.
+Counts the leaf nodes of the legal move tree to a fixed depth and compares them
+with the published counts of standard test positions.
+Run from the ai_chess_bot folder, e.g.:
+    python src/perft.py --depth 4
+    python src/perft.py --position kiwipete --depth 3 --divide
+    python src/perft.py --fen "8/8/8/8/8/8/8/K1k5 w - - 0 1" --depth 5 --workers 4
+
+The engine only promotes to a queen, so positions are only checked to depths
+where the published counts have no promotions.
+"""
+
+import argparse, multiprocessing, time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import Board, Move, START_FEN
+
+# name -> (fen, published leaf counts at depth 1, 2, ...)
+POSITIONS = {
+    'start': (START_FEN, [20, 400, 8902, 197281, 4865609]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 [48, 2039, 97862]),
+    'endgame': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2812, 43238, 674624]),
+    'middlegame': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                   [46, 2079, 89890]),
+    # en passant squares in the FEN (counts past depth 4 include underpromotions)
+    'ep-check': ('8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1', [15, 126, 1928, 13931]),
+    'ep-pin': ('8/5bk1/8/2Pp4/8/1K6/8/8 w - d6 0 1', [8, 104, 736, 9287]),
+}
+
+def perft(board, depth):
+    '''
+        Number of leaf nodes of the legal move tree of the given depth
+    '''
+    moves = board.generate(board.next_player)
+    # bulk counting: the moves of the last ply don't need to be made
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+def _perft_move(board, move, depth):
+    # leaf nodes under one root move
+    board.make_move(move)
+    nodes = perft(board, depth - 1)
+    board.unmake_move()
+    return nodes
+
+def divide(board, depth, workers=1):
+    '''
+        Leaf nodes under each root move: [(move, nodes)]. With workers > 1 the root
+        moves are counted in a pool of processes.
+    '''
+    moves = board.generate(board.next_player)
+    if depth == 1:
+        return [(move, 1) for move in moves]
+
+    if workers <= 1:
+        return [(move, _perft_move(board, move, depth)) for move in moves]
+
+    # spawn: same as the parallel search, forking isn't safe with pygame loaded
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(_perft_move, board, move, depth) for move in moves]
+        return [(move, future.result()) for move, future in zip(moves, futures)]
+
+def run(name, fen, depth, expected=None, show_divide=False, workers=1):
+    board = Board(fen)
+    start = time.time()
+    if show_divide or workers > 1:
+        counts = divide(board, depth, workers)
+        nodes = sum(count for move, count in counts)
+    else:
+        counts = None
+        nodes = perft(board, depth)
+    seconds = time.time() - start
+
+    if show_divide:
+        for move, count in counts:
+            print(f'  {Move.decode(move).coordinates()}: {count}')
+    status = ''
+    if expected is not None:
+        status = 'ok' if nodes == expected else f'MISMATCH (expected {expected})'
+    print(f'{name:<12} depth {depth}: {nodes:>10} nodes {seconds:>8.2f}s {nodes / max(seconds, 1e-9):>10.0f} nps  {status}')
+    return expected is None or nodes == expected
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Royal Gambit perft')
+    parser.add_argument('--position', choices=['all'] + list(POSITIONS), default='all')
+    parser.add_argument('--fen', help='count a FEN position instead of the test positions')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--divide', action='store_true', help='nodes under each root move')
+    parser.add_argument('--workers', type=int, default=1, help='processes counting the root moves')
+    args = parser.parse_args()
+
+    if args.fen:
+        run('fen', args.fen, args.depth, show_divide=args.divide, workers=args.workers)
+    else:
+        names = POSITIONS if args.position == 'all' else [args.position]
+        passed = True
+        for name in names:
+            fen, counts = POSITIONS[name]
+            depth = min(args.depth, len(counts))
+            passed &= run(name, fen, depth, counts[depth - 1], args.divide, args.workers)
+        if not passed:
+            raise SystemExit(1)
@@ -4,6 +4,7 @@ sound.py
 Sound class for Royal Gambit.
 """
 
+import os
 import pygame
 
 class Sound:
@@ -15,3 +16,13 @@ class Sound:
     def play(self):
         # Play the loaded sound effect
         pygame.mixer.Sound.play(self.sound)
+
+class Audio:
+    # name -> Sound, loaded once and shared by every Config
+    sounds = {}
+
+    @classmethod
+    def get(cls, name):
+        if name not in cls.sounds:
+            cls.sounds[name] = Sound(os.path.join(f'assets/sounds/{name}.wav'))
+        return cls.sounds[name]
@@ -0,0 +1,34 @@
+"""
+sprites.py
+----------
+Piece images for Royal Gambit, loaded once and converted to the display format.
+"""
+
+import os
+import pygame
+
+COLORS = ('white', 'black')
+NAMES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+SIZES = (80, 128) # board and dragged pieces
+
+class Sprites:
+    # (color, name, size) -> surface, shared by every game
+    images = None
+
+    @classmethod
+    def load(cls):
+        '''
+            Load every piece image (needs the display to be set for convert_alpha)
+        '''
+        cls.images = {}
+        for size in SIZES:
+            for color in COLORS:
+                for name in NAMES:
+                    path = os.path.join(f'assets/images/imgs-{size}px/{color}_{name}.png')
+                    cls.images[(color, name, size)] = pygame.image.load(path).convert_alpha()
+
+    @classmethod
+    def get(cls, piece, size=80):
+        if cls.images is None:
+            cls.load()
+        return cls.images[(piece.color, piece.name, size)]
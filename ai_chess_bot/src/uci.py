@@ -0,0 +1,202 @@
+"""
+uci.py
+----------
+UCI (Universal Chess Interface) front-end for the Royal Gambit AI, over stdin/stdout.
+Run from the ai_chess_bot folder:
+    python src/uci.py
+
+Input is read on its own thread, so 'stop' and 'isready' are answered while the
+main thread is searching. The engine only promotes to a queen, so promotion
+suffixes of incoming moves are ignored.
+"""
+
+import queue, sys, threading
+
+from engine import AI, Board, Move
+from engine.ai import MAX_PLY
+from engine.move import FLAGS, PROMOTION
+from engine.tt import TranspositionTable
+
+NAME = 'Royal Gambit'
+AUTHOR = 'jguapp'
+
+def move_text(move):
+    # coordinate notation of a packed move, with the promotion piece
+    text = Move.decode(move).coordinates()
+    if move & FLAGS == PROMOTION:
+        text += 'q'
+    return text
+
+class UCI:
+
+    def __init__(self, input=sys.stdin, output=sys.stdout):
+        self.input = input
+        self.output = output
+        self.ai = AI(engine='minimax')
+        self.board = Board()
+        self.commands = queue.Queue() # (line number, line)
+        self.lock = threading.Lock()
+        self.searching = False
+        self.last_stop = -1 # line number of the last 'stop'
+
+    def send(self, line):
+        with self.lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    # -----
+    # INPUT
+    # -----
+
+    def read(self):
+        '''
+            Read the input lines (on their own thread). A 'stop' interrupts the search
+            right away, the other commands wait for the main thread.
+        '''
+        for number, line in enumerate(self.input):
+            line = line.strip()
+            if line in ('stop', 'quit'):
+                with self.lock:
+                    self.last_stop = number
+                    self.ai.stop()
+            elif line == 'isready' and self.searching:
+                self.send('readyok')
+                continue
+            self.commands.put((number, line))
+        self.commands.put((None, 'quit'))
+
+    def loop(self):
+        threading.Thread(target=self.read, daemon=True).start()
+        while True:
+            number, line = self.commands.get()
+            if not self.command(number, line):
+                break
+        if self.ai.parallel is not None:
+            self.ai.parallel.close()
+
+    def command(self, number, line):
+        '''
+            Run one command, returns False on quit
+        '''
+        tokens = line.split()
+        if not tokens:
+            return True
+        name, args = tokens[0], tokens[1:]
+
+        if name == 'uci':
+            self.send(f'id name {NAME}')
+            self.send(f'id author {AUTHOR}')
+            self.send(f'option name Hash type spin default {self.ai.tt_size} min 1 max 1024')
+            self.send(f'option name Threads type spin default {self.ai.workers} min 1 max 64')
+            self.send('uciok')
+        elif name == 'isready':
+            self.send('readyok')
+        elif name == 'setoption':
+            self.set_option(args)
+        elif name == 'ucinewgame':
+            self.ai.tt.clear()
+            self.ai.history = [[0] * 64 for sq in range(64)]
+            self.board = Board()
+        elif name == 'position':
+            self.position(args)
+        elif name == 'go':
+            self.go(number, args)
+        elif name == 'quit':
+            return False
+        # 'stop' was already handled by the input thread
+        return True
+
+    # --------
+    # COMMANDS
+    # --------
+
+    def set_option(self, args):
+        # setoption name <name> value <value>
+        if 'name' not in args or 'value' not in args:
+            return
+        name = ' '.join(args[args.index('name') + 1:args.index('value')]).lower()
+        value = ' '.join(args[args.index('value') + 1:])
+        if name == 'hash':
+            self.ai.tt_size = int(value)
+            self.ai.tt = TranspositionTable(self.ai.tt_size)
+        elif name == 'threads':
+            self.ai.workers = int(value)
+            if self.ai.parallel is not None:
+                self.ai.parallel.close()
+                self.ai.parallel = None
+
+    def position(self, args):
+        # position startpos | fen <fen> [moves <move> ...]
+        moves = args.index('moves') if 'moves' in args else len(args)
+        if args and args[0] == 'fen':
+            board = Board(' '.join(args[1:moves]))
+        else:
+            board = Board()
+
+        for text in args[moves + 1:]:
+            for move in board.generate(board.next_player):
+                if move_text(move)[:4] == text[:4]:
+                    board.make_move(move)
+                    break
+            else:
+                break # illegal move: keep the position before it
+        self.board = board
+
+    def go(self, number, args):
+        '''
+            go [depth n] [movetime ms] [wtime ms] [btime ms] [winc ms] [binc ms]
+               [movestogo n] [nodes n] [infinite]
+        '''
+        options = {}
+        for i, token in enumerate(args):
+            if token in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo', 'nodes'):
+                options[token] = int(args[i + 1])
+
+        ai, board = self.ai, self.board
+        white = board.next_player == 'white'
+        ai.depth = options.get('depth', MAX_PLY - 1)
+        ai.node_limit = options.get('nodes')
+        ai.time_limit = None
+        if 'movetime' in options:
+            ai.time_limit = options['movetime'] / 1000
+        elif ('wtime' if white else 'btime') in options:
+            # share the clock between the moves left (30 when unknown)
+            left = options['wtime' if white else 'btime']
+            increment = options.get('winc' if white else 'binc', 0)
+            budget = left / options.get('movestogo', 30) + increment * 0.75
+            ai.time_limit = min(budget, left / 2) / 1000
+
+        with self.lock:
+            # a 'stop' read after this 'go' already counts
+            ai.stopped = self.last_stop > number
+            self.searching = True
+        ai.explored = 0
+        ai.tt.new_search()
+        try:
+            eval, move = ai.iterative_deepening(board, report=self.info)
+        finally:
+            self.searching = False
+
+        # stopped before the first depth finished: any legal move
+        if move is None:
+            moves = board.generate(board.next_player)
+            move = moves[0] if moves else None
+        self.send(f'bestmove {move_text(move) if move is not None else "0000"}')
+
+    def info(self, depth, eval, move, seconds, pv):
+        # the eval is from white's side, UCI scores are from the side to move
+        white = self.board.next_player == 'white'
+        if abs(eval) >= 5000:
+            # mate scores are 10000 + the depth left when the mate was found
+            plies = max(depth - int(abs(eval) - 10000), 1)
+            moves = (plies + 1) // 2
+            score = f'mate {moves if (eval > 0) == white else -moves}'
+        else:
+            score = f'cp {round(eval * 100) if white else -round(eval * 100)}'
+
+        nodes = self.ai.explored
+        self.send(f'info depth {depth} score {score} nodes {nodes} nps {int(nodes / max(seconds, 1e-3))} '
+                  f'time {int(seconds * 1000)} pv {" ".join(move_text(move) for move in pv or [move])}')
+
+if __name__ == '__main__':
+    UCI().loop()
@@ -4,23 +4,69 @@ utils.py
 Utility functions for Royal Gambit.
 """
 
+import queue, threading
 from PIL import Image
 import pygame
 
-def load_gif_frames(filename):
-    frames = []
-    gif = Image.open(filename)
-    try:
-        while True:
-            frame = gif.copy().convert('RGBA')
-            mode = frame.mode
-            size = frame.size
-            data = frame.tobytes()
-            py_image = pygame.image.fromstring(data, size, mode)
-            py_image = pygame.transform.scale(py_image, (pygame.display.get_surface().get_width(),
-                                                           pygame.display.get_surface().get_height()))
-            frames.append(py_image)
-            gif.seek(gif.tell() + 1)
-    except EOFError:
-        pass
-    return frames
+class GifFrames:
+    '''
+        Frames of an animated GIF, decoded lazily on a background thread and scaled
+        to a size. The first frame is ready right away; the others pass through a
+        bounded buffer, so at most `buffer` frames are resident. A GIF that fits in
+        the buffer is decoded once and kept.
+    '''
+
+    def __init__(self, filename, size, buffer=16):
+        self.gif = Image.open(filename)
+        self.size = size
+        self.count = getattr(self.gif, 'n_frames', 1)
+        self.keep = self.count <= buffer
+        self.ready = queue.Queue(maxsize=buffer) # decoded frames, in order
+        self.closed = False
+        self.frame = self._decode(0)
+        self.frames = [self.frame] # every frame, when kept
+        self.index = 0
+        if self.count > 1:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def _decode(self, index):
+        self.gif.seek(index)
+        frame = self.gif.convert('RGBA')
+        surface = pygame.image.fromstring(frame.tobytes(), frame.size, 'RGBA')
+        return pygame.transform.scale(surface, self.size).convert()
+
+    def _run(self):
+        index = 1
+        while not self.closed:
+            if index == self.count:
+                if self.keep:
+                    return
+                index = 0
+            frame = self._decode(index)
+            while not self.closed:
+                try:
+                    self.ready.put(frame, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+            index += 1
+
+    def next(self):
+        '''
+            Move to the next frame (stays on the current one until it's decoded)
+        '''
+        if self.keep and len(self.frames) == self.count:
+            self.index = (self.index + 1) % self.count
+            self.frame = self.frames[self.index]
+            return self.frame
+        try:
+            self.frame = self.ready.get_nowait()
+        except queue.Empty:
+            return self.frame
+        if self.keep:
+            self.frames.append(self.frame)
+            self.index = len(self.frames) - 1
+        return self.frame
+
+    def close(self):
+        self.closed = True